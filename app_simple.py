@@ -1,8 +1,11 @@
 import streamlit as st
+import hashlib
 import json
 import os
+from collections import deque
 from datetime import datetime
-from typing import Dict, List, Optional
+from itertools import groupby, islice
+from typing import Dict, List, Optional, Tuple
 import pandas as pd
 import openai
 from config.personalities import PersonalityResponseGenerator
@@ -206,16 +209,272 @@ PERSONALITY_RESPONSES = {
     }
 }
 
+# Chat history bounds: stored messages, and how many render as full chat bubbles
+CHAT_HISTORY_LIMIT = 200
+VISIBLE_CHAT_MESSAGES = 30
+
+# Personality-specific lead-ins for the next question
+EXTRAVERSION_INTROS = (
+    "Awesome, let's keep the ball rolling!",
+    "Great job! Let's jump into the next part.",
+    "Okay, let's get to the next exciting bit!",
+    "This is so insightful! Next up:",
+)
+
+CONSCIENTIOUSNESS_INTROS = (
+    "Proceeding to the next logical step:",
+    "For our next point of analysis:",
+    "To continue our systematic review:",
+    "The next item on our agenda is:",
+)
+
+QUESTION_INTROS = {
+    'extraversion': EXTRAVERSION_INTROS,
+    'conscientiousness': CONSCIENTIOUSNESS_INTROS
+}
+
+SYSTEM_PROMPT_TEMPLATE = (
+    "You are a compassionate CBT journaling assistant. Your primary goal is to help the user through a structured CBT session. "
+    "You MUST adopt the following personality style when crafting your response. This style guide is your highest priority. "
+    "Follow all lexical, syntactic, and behavioral patterns described.\n\n"
+    "--- PERSONALITY STYLE GUIDE ---\n{style_guide}\n--- END STYLE GUIDE ---\n\n"
+    "Acknowledge the user's input, provide a brief reflective statement, and encourage them to answer the next question. "
+    "Your response should seamlessly transition to the next step of the CBT flow.\n\n"
+    "Return a JSON object with the keys 'reply' (your response to the user, at most about 90 words), 'sentiment' (positive, neutral, or negative) "
+    "and 'keywords' (3 main keywords from the user's answer, comma-separated)."
+)
+
+# The reply keeps the 120-token budget it had as plain text (about 90 words, as the
+# prompt asks); the extra tokens cover the sentiment, keywords and JSON syntax
+FEEDBACK_REPLY_TOKENS = 120
+FEEDBACK_MAX_TOKENS = FEEDBACK_REPLY_TOKENS + 40
+
+# Matches APP_CONFIG['session']['max_response_length']; bounds both the prompt and the cache key
+SENTIMENT_INPUT_LIMIT = 2000
+
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 TEMPLATE_PATH = os.path.join(BASE_DIR, "templates", "cbt_templates.txt")
 BIG5_TEMPLATE_PATH = os.path.join(BASE_DIR, "templates", "big5_personality_templates.txt")
 
+@st.cache_resource
+def _load_condition_templates():
+    """Load CBT condition templates once per process"""
+    templates = {}
+    try:
+        with open(TEMPLATE_PATH, 'r', encoding='utf-8') as f:
+            text = f.read()
+        sections = {
+            'stress': 'User with stress condition:',
+            'anxiety': 'User with anxious condition:',
+            'lowMood': 'User with low mood condition:'
+        }
+        # Markers appear in file order, so each search resumes from the previous hit
+        offset = 0
+        for key, marker in sections.items():
+            start = text.find(marker, offset)
+            if start != -1:
+                templates[key] = text[start:start + 1500]
+                offset = start + len(marker)
+    except Exception as e:
+        print("Could not load templates", e)
+    return templates
+
+@st.cache_resource
+def _load_big5_templates():
+    """Load Big Five personality templates once per process"""
+    templates = {}
+    try:
+        with open(BIG5_TEMPLATE_PATH, 'r', encoding='utf-8') as f:
+            text = f.read()
+        
+        conscientious_marker = "2. HIGH CONSCIENTIOUSNESS TEMPLATE"
+        extraversion_marker = "3. HIGH EXTRAVERSION TEMPLATE"
+        
+        conscientious_start = text.index(conscientious_marker)
+        extraversion_start = text.index(extraversion_marker, conscientious_start)
+        
+        templates['neutral'] = text[:conscientious_start].strip()
+        templates['conscientiousness'] = conscientious_marker + '\n' + text[conscientious_start + len(conscientious_marker):extraversion_start].strip()
+        templates['extraversion'] = extraversion_marker + '\n' + text[extraversion_start + len(extraversion_marker):].strip()
+
+    except Exception as e:
+        print(f"Could not load Big 5 personality templates: {e}")
+    return templates
+
+
+@st.cache_resource
+def _build_system_prompts():
+    """Render the GPT system prompt for each personality with a non-empty style guide"""
+    return {
+        personality: SYSTEM_PROMPT_TEMPLATE.format(style_guide=style_guide)
+        for personality, style_guide in _load_big5_templates().items()
+        if style_guide
+    }
+
+@st.cache_resource
+def _build_template_refs():
+    """Truncated condition templates used as GPT session context"""
+    return {condition: text[:1000] for condition, text in _load_condition_templates().items()}
+
+@st.cache_resource
+def _prewarm_textblob():
+    """Force TextBlob's lazy corpus loading once per process"""
+    try:
+        blob = TextBlob("Warming up the sentiment analyser.")
+        blob.sentiment
+        blob.noun_phrases
+    except Exception as e:
+        print("Could not prewarm TextBlob", e)
+    return True
+
+
+@st.cache_resource
+def _template_digests():
+    """SHA1 of each loaded template, used as cheap cache keys for GPT calls"""
+    return {
+        'big5': {key: hashlib.sha1(text.encode('utf-8')).hexdigest()
+                 for key, text in _load_big5_templates().items()},
+        'condition': {key: hashlib.sha1(text.encode('utf-8')).hexdigest()
+                      for key, text in _load_condition_templates().items()}
+    }
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _gpt_feedback(personality: str, condition: str, question_id: str, user_input: str, step: int,
+                  style_digest: str, template_digest: str,
+                  _system_prompt: str, _user_msg: str) -> Tuple[str, str, str]:
+    """Request the personality-styled JSON feedback envelope from OpenAI; memoized on the hashed arguments"""
+    completion = openai.ChatCompletion.create(
+        model="gpt-3.5-turbo",
+        messages=[
+            {"role": "system", "content": _system_prompt},
+            {"role": "user", "content": _user_msg},
+        ],
+        response_format={"type": "json_object"},
+        max_tokens=FEEDBACK_MAX_TOKENS,
+        temperature=0.7,
+    )
+    # A reply cut off at max_tokens is not valid JSON; raising keeps it out of the cache
+    data = json.loads(completion.choices[0].message.content)
+    if not isinstance(data, dict):
+        raise ValueError("GPT feedback is not a JSON object")
+    reply, sentiment, keywords = (data.get(key, "") for key in ("reply", "sentiment", "keywords"))
+    return (
+        reply.strip() if isinstance(reply, str) else "",
+        sentiment if isinstance(sentiment, str) else "",
+        keywords if isinstance(keywords, str) else ""
+    )
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _gpt_sentiment(text: str) -> str:
+    """Request sentiment and keywords JSON from OpenAI; memoized on the input text"""
+    completion = openai.ChatCompletion.create(
+        model="gpt-3.5-turbo",
+        messages=[
+            {"role": "system", "content": "You are a helpful assistant that extracts sentiment (positive, neutral, negative) and 3 main keywords from user text, return JSON with 'sentiment' and 'keywords' (comma-separated)."},
+            {"role": "user", "content": text}
+        ],
+        response_format={"type": "json_object"},
+        max_tokens=30,
+        temperature=0.0,
+    )
+    return completion.choices[0].message.content
+
+
+def _fallback_keywords(text: str) -> str:
+    """First three distinct alphabetic words longer than three letters, comma-separated"""
+    seen = set()
+    unique = []
+    for word in text.split():
+        word = word.strip('.,!?').lower()
+        # isalpha() rejects numeric characters such as '½' or '²' that [^\W\d_] lets through
+        if word.isalpha() and len(word) > 3 and word not in seen:
+            seen.add(word)
+            unique.append(word)
+            if len(unique) == 3:
+                break
+    return ", ".join(unique)
+
+
+JOURNAL_HEADER_TEMPLATE = """# CBT Journal Entry - {condition_name} Session
+
+**Session Date:** {session_date}
+**Condition Focus:** {condition_name}
+**Chatbot Personality:** {personality_name}
+
+---
+
+## Session Responses
+
+"""
+
+JOURNAL_FOOTER_TEMPLATE = """---
+
+## Session Summary
+
+This CBT session helped me explore the connections between my situation, thoughts, emotions, and behaviors. Through systematic examination, I identified key patterns and developed more balanced perspectives. The insights gained from this session provide a foundation for implementing healthier coping strategies.
+
+**Next Steps:** Continue practicing the balanced thoughts and coping strategies identified in this session.
+
+---
+
+*Session completed on {completion_date} using {personality_name} personality style.*
+"""
+
+JOURNAL_CONDITION_NAMES = {'stress': 'Stress', 'anxiety': 'Anxiety', 'lowMood': 'Low Mood'}
+JOURNAL_PERSONALITY_NAMES = {
+    'neutral': 'Neutral',
+    'conscientiousness': 'High Conscientiousness',
+    'extraversion': 'High Extraversion'
+}
+
+# Distinct sessions whose response sections are kept in the process-wide cache
+JOURNAL_CACHE_ENTRIES = 64
+
+
+@st.cache_data(max_entries=JOURNAL_CACHE_ENTRIES, ttl=3600, show_spinner=False)
+def _journal_sections(condition: str, responses: tuple) -> Tuple[str, ...]:
+    """One Q/A block per run of answered questions sharing a category (responses parallel the flow, None if unanswered)"""
+    sections = []
+    current_category = ""
+    
+    for question, answer in zip(CBT_FLOWS[condition], responses):
+        if answer is not None:
+            if question['category'] != current_category:
+                current_category = question['category']
+                sections.append([f"\n### {current_category}\n\n"])
+            
+            sections[-1].append(f"**Q:** {question['text']}\n\n**A:** {answer}\n\n")
+    
+    return tuple(''.join(section) for section in sections)
+
+
+def _build_journal(condition: str, personality: str, responses: tuple,
+                   session_date: str, completion_date: str) -> str:
+    """Assemble journal markdown: dated header, cached response sections, dated footer"""
+    condition_name = JOURNAL_CONDITION_NAMES[condition]
+    personality_name = JOURNAL_PERSONALITY_NAMES[personality]
+    # Only the header and footer carry the dates, so the cached sections stay
+    # valid for every regeneration of the same responses
+    return ''.join((
+        JOURNAL_HEADER_TEMPLATE.format(
+            condition_name=condition_name, session_date=session_date, personality_name=personality_name
+        ),
+        *_journal_sections(condition, responses),
+        JOURNAL_FOOTER_TEMPLATE.format(completion_date=completion_date, personality_name=personality_name)
+    ))
+
+
 class CBTChatbotApp:
     def __init__(self):
         self.generator = PersonalityResponseGenerator()
         self.init_session_state()
         self.condition_templates = self.load_condition_templates()
         self.big5_templates = self.load_big5_templates()
+        self.system_prompts = _build_system_prompts()
+        self.template_refs = _build_template_refs()
+        _prewarm_textblob()
         
     def init_session_state(self):
         """Initialize session state variables"""
@@ -225,10 +484,18 @@ class CBTChatbotApp:
             st.session_state.current_condition = None
         if 'current_step' not in st.session_state:
             st.session_state.current_step = 0
+        if 'flow' not in st.session_state:
+            st.session_state.flow = []
+            st.session_state.flow_len = 0
         if 'responses' not in st.session_state:
             st.session_state.responses = {}
+        if 'responses_arr' not in st.session_state:
+            st.session_state.responses_arr = [st.session_state.responses.get(q['id']) for q in st.session_state.flow]
+        if 'resp_count' not in st.session_state:
+            st.session_state.resp_char_total = sum(len(response) for response in st.session_state.responses.values())
+            st.session_state.resp_count = len(st.session_state.responses)
         if 'chat_history' not in st.session_state:
-            st.session_state.chat_history = []
+            st.session_state.chat_history = deque(maxlen=CHAT_HISTORY_LIMIT)
         if 'session_complete' not in st.session_state:
             st.session_state.session_complete = False
         if 'journal_generated' not in st.session_state:
@@ -241,9 +508,14 @@ class CBTChatbotApp:
     def reset_session(self):
         """Reset all session variables"""
         st.session_state.current_condition = None
+        st.session_state.flow = []
+        st.session_state.flow_len = 0
         st.session_state.current_step = 0
         st.session_state.responses = {}
-        st.session_state.chat_history = []
+        st.session_state.responses_arr = []
+        st.session_state.resp_char_total = 0
+        st.session_state.resp_count = 0
+        st.session_state.chat_history = deque(maxlen=CHAT_HISTORY_LIMIT)
         st.session_state.session_complete = False
         st.session_state.journal_generated = False
         st.rerun()
@@ -340,9 +612,14 @@ class CBTChatbotApp:
 
     def start_condition(self, condition: str):
         st.session_state.current_condition = condition
+        st.session_state.flow = CBT_FLOWS[condition]
+        st.session_state.flow_len = len(st.session_state.flow)
         st.session_state.current_step = 0
-        st.session_state.chat_history = []
+        st.session_state.chat_history = deque(maxlen=CHAT_HISTORY_LIMIT)
         st.session_state.responses = {}
+        st.session_state.responses_arr = [None] * st.session_state.flow_len
+        st.session_state.resp_char_total = 0
+        st.session_state.resp_count = 0
         st.session_state.session_complete = False
         st.session_state.journal_generated = False
         
@@ -354,7 +631,7 @@ class CBTChatbotApp:
             'lowMood': "Excellent! Let's understand your low mood through the CBT 5-Part Model."
         }
         
-        first_question = CBT_FLOWS[condition][0]
+        first_question = st.session_state.flow[0]
         
         st.session_state.chat_history.extend([
             {'type': 'bot', 'message': welcome_msg, 'personality': st.session_state.current_personality},
@@ -380,18 +657,25 @@ class CBTChatbotApp:
             st.header(f"💬 CBT Session: {condition_names[st.session_state.current_condition]}", anchor=False)
             st.caption(f"Personality: {personality_names[st.session_state.current_personality]}")
         
+        chat_history = st.session_state.chat_history
+        hidden_count = max(0, len(chat_history) - VISIBLE_CHAT_MESSAGES)
+        
         chat_container = st.container()
         with chat_container:
-            for chat in st.session_state.chat_history:
-                if chat['type'] == 'user':
-                    with st.chat_message("user"):
-                        st.write(chat['message'])
-                else:
-                    with st.chat_message("assistant"):
-                        st.write(chat['message'])
+            if hidden_count:
+                with st.expander(f"Earlier messages ({hidden_count})"):
+                    st.markdown("\n\n".join(
+                        f"**{'You' if chat['type'] == 'user' else 'Assistant'}:** {chat['message']}"
+                        for chat in islice(chat_history, hidden_count)
+                    ))
+            # Consecutive messages from the same speaker share one bubble and one markdown parse
+            visible = islice(chat_history, hidden_count, None)
+            for is_user, group in groupby(visible, key=lambda chat: chat['type'] == 'user'):
+                with st.chat_message("user" if is_user else "assistant"):
+                    st.markdown("\n\n".join(chat['message'] for chat in group))
         
         if not st.session_state.session_complete:
-            total_questions = len(CBT_FLOWS[st.session_state.current_condition])
+            total_questions = st.session_state.flow_len
             progress = (st.session_state.current_step + 1) / total_questions
             st.progress(progress, text=f"Progress: {st.session_state.current_step + 1}/{total_questions}")
         
@@ -402,19 +686,26 @@ class CBTChatbotApp:
 
     def render_input_interface(self):
         with st.form("response_form", clear_on_submit=True):
-            user_input = st.text_area(
+            st.text_area(
                 "Your response:",
                 placeholder="Type your response here...",
                 height=100,
                 key="user_input"
             )
-            submitted = st.form_submit_button("Submit Response", use_container_width=True)
-            
-            if submitted and user_input.strip():
-                self.process_user_response(user_input.strip())
+            # Handled in a callback so state is updated before this rerun renders the chat
+            st.form_submit_button(
+                "Submit Response",
+                use_container_width=True,
+                on_click=self._on_response_submitted
+            )
+
+    def _on_response_submitted(self):
+        user_input = st.session_state.get("user_input", "").strip()
+        if user_input:
+            self.process_user_response(user_input)
 
     def process_user_response(self, user_input: str):
-        current_question = CBT_FLOWS[st.session_state.current_condition][st.session_state.current_step]
+        current_question = st.session_state.flow[st.session_state.current_step]
         
         st.session_state.chat_history.append({
             'type': 'user', 
@@ -422,10 +713,13 @@ class CBTChatbotApp:
         })
         
         st.session_state.responses[current_question['id']] = user_input
+        st.session_state.responses_arr[st.session_state.current_step] = user_input
+        st.session_state.resp_char_total += len(user_input)
+        st.session_state.resp_count += 1
         
         gpt_success = False
         if openai.api_key:
-            feedback = self.generate_gpt_feedback(
+            feedback, sentiment, keywords = self.generate_gpt_feedback(
                 st.session_state.current_personality,
                 current_question,
                 user_input,
@@ -440,6 +734,7 @@ class CBTChatbotApp:
                 )
             else:
                 gpt_success = True
+                feedback += self._format_input_analysis(sentiment, keywords)
         else:
             base_feedback = self.generator.generate_response(
                 st.session_state.current_personality,
@@ -448,12 +743,7 @@ class CBTChatbotApp:
                 st.session_state.current_step
             )
             sentiment, keywords = self.analyze_user_input(user_input)
-            extra = ""
-            if sentiment:
-                extra += f" I sense you may be feeling **{sentiment}**."
-            if keywords:
-                extra += f" Key themes I noticed: *{keywords}*."
-            feedback = base_feedback + extra
+            feedback = base_feedback + self._format_input_analysis(sentiment, keywords)
 
         st.session_state.chat_history.append({
             'type': 'bot',
@@ -461,12 +751,12 @@ class CBTChatbotApp:
             'personality': st.session_state.current_personality
         })
         
-        total_questions = len(CBT_FLOWS[st.session_state.current_condition])
+        total_questions = st.session_state.flow_len
         
         if st.session_state.current_step < total_questions - 1:
             st.session_state.current_step += 1
             if not gpt_success:
-                next_question = CBT_FLOWS[st.session_state.current_condition][st.session_state.current_step]
+                next_question = st.session_state.flow[st.session_state.current_step]
                 styled_q = self._style_question_with_personality(st.session_state.current_personality, next_question['text'])
                 st.session_state.chat_history.append({
                     'type': 'bot',
@@ -480,16 +770,13 @@ class CBTChatbotApp:
                 'message': "You've completed the CBT reflection process! Would you like me to generate a journal summary of your session?",
                 'personality': st.session_state.current_personality
             })
-        
-        st.rerun()
 
     def render_completion_interface(self):
         col1, col2 = st.columns(2)
         
         with col1:
             if not st.session_state.journal_generated:
-                if st.button("📝 Generate Journal Entry", use_container_width=True):
-                    self.generate_journal()
+                st.button("📝 Generate Journal Entry", use_container_width=True, on_click=self.generate_journal)
             else:
                 if st.button("💾 Download Journal", use_container_width=True):
                     self.download_journal()
@@ -512,59 +799,23 @@ class CBTChatbotApp:
             'message': f"I've generated your journal entry! {closing_msg}",
             'personality': st.session_state.current_personality
         })
-        
-        st.rerun()
 
     def create_journal(self):
-        condition_names = {'stress': 'Stress', 'anxiety': 'Anxiety', 'lowMood': 'Low Mood'}
-        personality_names = {
-            'neutral': 'Neutral',
-            'conscientiousness': 'High Conscientiousness',
-            'extraversion': 'High Extraversion'
-        }
-        
-        journal = f"""# CBT Journal Entry - {condition_names[st.session_state.current_condition]} Session
-
-**Session Date:** {datetime.now().strftime('%B %d, %Y at %I:%M %p')}
-**Condition Focus:** {condition_names[st.session_state.current_condition]}
-**Chatbot Personality:** {personality_names[st.session_state.current_personality]}
-
----
-
-## Session Responses
-
-"""
-        
-        questions = CBT_FLOWS[st.session_state.current_condition]
-        current_category = ""
-        
-        for question in questions:
-            if question['id'] in st.session_state.responses:
-                if question['category'] != current_category:
-                    current_category = question['category']
-                    journal += f"\n### {current_category}\n\n"
-                
-                journal += f"**Q:** {question['text']}\n\n"
-                journal += f"**A:** {st.session_state.responses[question['id']]}\n\n"
-        
-        journal += f"""---
-
-## Session Summary
-
-This CBT session helped me explore the connections between my situation, thoughts, emotions, and behaviors. Through systematic examination, I identified key patterns and developed more balanced perspectives. The insights gained from this session provide a foundation for implementing healthier coping strategies.
-
-**Next Steps:** Continue practicing the balanced thoughts and coping strategies identified in this session.
-
----
-
-*Session completed on {datetime.now().strftime('%B %d, %Y')} using {personality_names[st.session_state.current_personality]} personality style.*
-"""
-        
-        return journal
+        now = datetime.now()
+        st.session_state.journal_ts = now
+        responses = tuple(st.session_state.responses_arr)
+        return _build_journal(
+            st.session_state.current_condition,
+            st.session_state.current_personality,
+            responses,
+            now.strftime('%B %d, %Y at %I:%M %p'),
+            now.strftime('%B %d, %Y')
+        )
 
     def download_journal(self):
         if st.session_state.journal_generated:
-            filename = f"cbt-journal-{st.session_state.current_condition}-{st.session_state.current_personality}-{datetime.now().strftime('%Y-%m-%d')}.md"
+            journal_ts = st.session_state.get('journal_ts') or datetime.now()
+            filename = f"cbt-journal-{st.session_state.current_condition}-{st.session_state.current_personality}-{journal_ts.strftime('%Y-%m-%d')}.md"
             
             st.download_button(
                 label="💾 Download Journal Entry",
@@ -582,11 +833,11 @@ This CBT session helped me explore the connections between my situation, thought
             condition_names = {'stress': 'Stress', 'anxiety': 'Anxiety', 'lowMood': 'Low Mood'}
             st.sidebar.metric("Current Condition", condition_names[st.session_state.current_condition])
             
-            total_questions = len(CBT_FLOWS[st.session_state.current_condition])
+            total_questions = st.session_state.flow_len
             st.sidebar.metric("Questions Answered", f"{st.session_state.current_step + 1}/{total_questions}")
             
-            if st.session_state.responses:
-                avg_length = sum(len(response) for response in st.session_state.responses.values()) // len(st.session_state.responses)
+            if st.session_state.resp_count:
+                avg_length = st.session_state.resp_char_total // st.session_state.resp_count
                 st.sidebar.metric("Avg Response Length", f"{avg_length} chars")
         
         st.sidebar.divider()
@@ -623,17 +874,7 @@ This CBT session helped me explore the connections between my situation, thought
         if api_key:
             openai.api_key = api_key
             try:
-                completion = openai.ChatCompletion.create(
-                    model="gpt-3.5-turbo",
-                    messages=[
-                        {"role": "system", "content": "You are a helpful assistant that extracts sentiment (positive, neutral, negative) and 3 main keywords from user text, return JSON with 'sentiment' and 'keywords' (comma-separated)."},
-                        {"role": "user", "content": text}
-                    ],
-                    max_tokens=30,
-                    temperature=0.0,
-                )
-                import json
-                content = completion.choices[0].message.content
+                content = _gpt_sentiment(text[:SENTIMENT_INPUT_LIMIT])
                 data = json.loads(content)
                 sentiment = data.get("sentiment", "")
                 keywords = data.get("keywords", "")
@@ -651,120 +892,67 @@ This CBT session helped me explore the connections between my situation, thought
             try:
                 keywords = ", ".join(blob.noun_phrases[:3])
             except Exception:
-                words = [w.strip('.,!?').lower() for w in text.split()]
-                unique = []
-                for w in words:
-                    if w.isalpha() and len(w) > 3 and w not in unique:
-                        unique.append(w)
-                    if len(unique) == 3:
-                        break
-                keywords = ", ".join(unique)
+                keywords = _fallback_keywords(text)
         return sentiment, keywords
 
-    def generate_gpt_feedback(self, personality: str, question: dict, user_input: str, step: int) -> str:
-        """Get feedback from OpenAI based on personality style"""
+    def generate_gpt_feedback(self, personality: str, question: dict, user_input: str, step: int) -> Tuple[str, str, str]:
+        """Get feedback, sentiment and keywords from a single OpenAI call based on personality style"""
         if not openai.api_key:
-            return ""
+            return "", "", ""
 
-        style_guide = self.big5_templates.get(personality, "")
-        if not style_guide:
+        system_prompt = self.system_prompts.get(personality)
+        if system_prompt is None:
             print(f"Warning: Could not find style guide for personality '{personality}'")
+            system_prompt = SYSTEM_PROMPT_TEMPLATE.format(style_guide="")
 
-        system_prompt = (
-            "You are a compassionate CBT journaling assistant. Your primary goal is to help the user through a structured CBT session. "
-            "You MUST adopt the following personality style when crafting your response. This style guide is your highest priority. "
-            "Follow all lexical, syntactic, and behavioral patterns described.\n\n"
-            f"--- PERSONALITY STYLE GUIDE ---\n{style_guide}\n--- END STYLE GUIDE ---\n\n"
-            "Acknowledge the user's input, provide a brief reflective statement, and encourage them to answer the next question. "
-            "Your response should seamlessly transition to the next step of the CBT flow."
-        )
-
-        template_ref = self.condition_templates.get(st.session_state.current_condition, "")
+        template_ref = self.template_refs.get(st.session_state.current_condition, "")
 
         user_msg = (
-            f"Current CBT Session Context:\n{template_ref[:1000]}\n\n"
+            f"Current CBT Session Context:\n{template_ref}\n\n"
             f"The user is on step {step + 1}. The current question was: '{question.get('text')}'\n"
             f"The user's answer is: '{user_input}'\n\n"
             "Now, generate a response that helps the user and perfectly matches the personality style guide."
         )
+        digests = _template_digests()
         try:
-            completion = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_msg},
-                ],
-                max_tokens=120,
-                temperature=0.7,
+            return _gpt_feedback(
+                personality,
+                st.session_state.current_condition,
+                question.get('id', ''),
+                user_input,
+                step,
+                digests['big5'].get(personality, ''),
+                digests['condition'].get(st.session_state.current_condition, ''),
+                system_prompt,
+                user_msg
             )
-            return completion.choices[0].message.content.strip()
         except Exception as e:
+            # Includes truncated or malformed JSON, so the caller falls back to the local generator
             print("GPT feedback error", e)
-            return ""
+            return "", "", ""
+
+    def _format_input_analysis(self, sentiment: str, keywords: str) -> str:
+        """Render the sentiment/keyword sentence appended to bot feedback"""
+        extra = ""
+        if sentiment:
+            extra += f" I sense you may be feeling **{sentiment}**."
+        if keywords:
+            extra += f" Key themes I noticed: *{keywords}*."
+        return extra
 
     def load_condition_templates(self):
-        templates = {}
-        try:
-            with open(TEMPLATE_PATH, 'r', encoding='utf-8') as f:
-                text = f.read()
-            sections = {
-                'stress': 'User with stress condition:',
-                'anxiety': 'User with anxious condition:',
-                'lowMood': 'User with low mood condition:'
-            }
-            for key, marker in sections.items():
-                start = text.find(marker)
-                if start != -1:
-                    end = min(len(text), start + 1500)
-                    templates[key] = text[start:end]
-        except Exception as e:
-            print("Could not load templates", e)
-        return templates
+        return _load_condition_templates()
 
     def load_big5_templates(self):
         """Load Big Five personality templates"""
-        templates = {}
-        try:
-            with open(BIG5_TEMPLATE_PATH, 'r', encoding='utf-8') as f:
-                text = f.read()
-            
-            conscientious_marker = "2. HIGH CONSCIENTIOUSNESS TEMPLATE"
-            extraversion_marker = "3. HIGH EXTRAVERSION TEMPLATE"
-            
-            parts = text.split(conscientious_marker)
-            templates['neutral'] = parts[0].strip()
-            
-            remaining = parts[1]
-            parts = remaining.split(extraversion_marker)
-            templates['conscientiousness'] = conscientious_marker + '\n' + parts[0].strip()
-            templates['extraversion'] = extraversion_marker + '\n' + parts[1].strip()
-
-        except Exception as e:
-            print(f"Could not load Big 5 personality templates: {e}")
-        return templates
+        return _load_big5_templates()
 
     def _style_question_with_personality(self, personality: str, question_text: str) -> str:
         """Apply personality-specific styling to questions"""
-        if personality == 'extraversion':
-            intros = [
-                "Awesome, let's keep the ball rolling!",
-                "Great job! Let's jump into the next part.",
-                "Okay, let's get to the next exciting bit!",
-                "This is so insightful! Next up:",
-            ]
-            return f"{random.choice(intros)} {question_text}"
-
-        elif personality == 'conscientiousness':
-            intros = [
-                "Proceeding to the next logical step:",
-                "For our next point of analysis:",
-                "To continue our systematic review:",
-                "The next item on our agenda is:",
-            ]
+        intros = QUESTION_INTROS.get(personality)
+        if intros:
             return f"{random.choice(intros)} {question_text}"
-        
-        else:
-            return question_text
+        return question_text
 
 if __name__ == "__main__":
     app = CBTChatbotApp()
@@ -2,15 +2,160 @@
 Personality Response Generator for CBT Chatbot Research System
 """
 
-import random
-from typing import Dict, List, Any
+import sys
+from functools import lru_cache
+from string import Formatter
+from types import MappingProxyType
+from typing import Dict, Any
+
+
+# Category-specific context and insight sentences, keyed by personality then CBT category
+CATEGORY_CONTEXTS = MappingProxyType({
+    'neutral': MappingProxyType({
+        'Situation/Trigger': 'Understanding the trigger is an important first step.',
+        'Thoughts': 'Identifying these thoughts is an important part of the process.',
+        'Emotions': 'Recognizing your emotional responses helps us understand your experience.',
+        'Behaviors': 'Understanding your behavioral responses provides insight into coping patterns.',
+        'Physical Reactions': 'Physical symptoms often reflect our mental state.',
+        'Cognitive Distortions': 'Recognizing thinking patterns is valuable for developing awareness.',
+        'Examine Evidence': 'This evaluation process helps develop balanced perspectives.',
+        'Balanced Thought': 'Creating alternative thoughts is a key CBT skill.',
+        'Action Planning': 'Planning concrete actions helps translate insights into practice.'
+    }),
+    'conscientiousness': MappingProxyType({
+        'Situation/Trigger': 'Systematic analysis of triggers provides crucial foundational data for our comprehensive examination.',
+        'Thoughts': 'Methodical identification of cognitive patterns enables thorough analysis of your thought processes.',
+        'Emotions': 'Precise emotional assessment is essential for comprehensive understanding of your affective responses.',
+        'Behaviors': 'Detailed behavioral analysis provides critical insights into your response patterns and coping mechanisms.',
+        'Physical Reactions': 'Systematic documentation of physiological responses enhances our comprehensive assessment.',
+        'Cognitive Distortions': 'Rigorous examination of thinking patterns is fundamental to evidence-based cognitive restructuring.',
+        'Examine Evidence': 'This systematic evaluation process is essential for developing well-founded, balanced perspectives.',
+        'Balanced Thought': 'Structured cognitive reframing represents a core evidence-based therapeutic technique.',
+        'Action Planning': 'Strategic action planning ensures systematic implementation of therapeutic insights.'
+    }),
+    'extraversion': MappingProxyType({
+        'Situation/Trigger': "I love that you're diving right into understanding what sparked these feelings!",
+        'Thoughts': 'This is so important - getting clear on these thoughts is going to be super helpful!',
+        'Emotions': "You're doing amazing work exploring these emotions - this is really valuable stuff!",
+        'Behaviors': "I'm so glad we're looking at this together - understanding your responses is incredibly insightful!",
+        'Physical Reactions': "This mind-body connection stuff is fascinating, and you're really getting it!",
+        'Cognitive Distortions': "You're being so brave examining these thinking patterns - this is powerful work!",
+        'Examine Evidence': "I love this part - we're like detectives uncovering the real story here!",
+        'Balanced Thought': "This is so exciting - you're building new, healthier ways of thinking!",
+        'Action Planning': "Yes! I'm thrilled we're moving into action mode - this is where the magic happens!"
+    })
+})
+
+CATEGORY_INSIGHTS = MappingProxyType({
+    'neutral': MappingProxyType({
+        'Thoughts': 'Identifying these thoughts helps us understand your mental patterns.',
+        'Emotions': 'Understanding emotional responses is key to the CBT process.',
+        'Behaviors': 'Behavioral patterns often reflect our internal states.',
+        'Physical Reactions': 'The mind-body connection is an important aspect to explore.'
+    }),
+    'conscientiousness': MappingProxyType({
+        'Thoughts': 'Systematic thought identification enables comprehensive cognitive analysis.',
+        'Emotions': 'Methodical emotional assessment provides essential diagnostic clarity.',
+        'Behaviors': 'Structured behavioral analysis yields crucial therapeutic insights.',
+        'Physical Reactions': 'Systematic physiological assessment enhances diagnostic precision.'
+    }),
+    'extraversion': MappingProxyType({
+        'Thoughts': 'Getting clear on thoughts is so empowering!',
+        'Emotions': 'Understanding emotions is incredibly valuable for personal growth!',
+        'Behaviors': 'Exploring behaviors together is such meaningful work!',
+        'Physical Reactions': 'The mind-body connection is absolutely fascinating!'
+    })
+})
+# Progress sentences per personality for steps 0-4, 5-9 and 10+
+STEP_INSIGHTS = MappingProxyType({
+    'neutral': (
+        "This information helps build our understanding.",
+        "We're making good progress in this exploration.",
+        "This reflection process is helping develop important insights."
+    ),
+    'conscientiousness': (
+        "This foundational information will inform our subsequent systematic analysis.",
+        "We're building a comprehensive understanding through methodical examination.",
+        "This systematic approach ensures thorough therapeutic progress."
+    ),
+    'extraversion': (
+        "We're off to such a great start with this exploration!",
+        "I'm loving how this is unfolding - you're doing fantastic work!",
+        "Look at all this amazing progress we're making together!"
+    )
+})
+
+# Personalities with templates; anything else falls back to 'neutral'
+_VALID_PERSONALITIES = frozenset(('neutral', 'conscientiousness', 'extraversion'))
+
+
+def _intern_strings(obj: Any) -> Any:
+    """Recursively intern every string in a nested template structure"""
+    if isinstance(obj, str):
+        return sys.intern(obj)
+    if isinstance(obj, dict):
+        return {sys.intern(key): _intern_strings(value) for key, value in obj.items()}
+    if isinstance(obj, list):
+        return [_intern_strings(item) for item in obj]
+    return obj
+
+
+def _step_bucket(step: int) -> int:
+    """Index into STEP_INSIGHTS for a given step"""
+    return 0 if step < 5 else 1 if step < 10 else 2
+
+
+# Pure lookups over a small input domain, memoized at module scope
+@lru_cache(maxsize=64)
+def _category_context(category: str, personality: str) -> str:
+    return CATEGORY_CONTEXTS.get(personality, CATEGORY_CONTEXTS['neutral']).get(category, '')
+
+
+@lru_cache(maxsize=64)
+def _category_insight(category: str, personality: str) -> str:
+    return CATEGORY_INSIGHTS.get(personality, CATEGORY_INSIGHTS['neutral']).get(category, '')
+
+
+@lru_cache(maxsize=16)
+def _step_insight(bucket: int, personality: str) -> str:
+    return STEP_INSIGHTS.get(personality, STEP_INSIGHTS['neutral'])[bucket]
 
 
 class PersonalityResponseGenerator:
     """Generates personality-specific responses for CBT chatbot interactions"""
+
+    __slots__ = (
+        'personality_templates',
+        '_patterns',
+        '_compiled_patterns',
+        '_pattern_fields',
+        '_response_cache',
+        '_welcome',
+        '_closing'
+    )
     
     def __init__(self):
-        self.personality_templates = self._load_personality_templates()
+        self.personality_templates = _intern_strings(self._load_personality_templates())
+        self._patterns = {
+            personality: template['response_patterns']
+            for personality, template in self.personality_templates.items()
+        }
+        # Each pattern pre-split into (literal, field name or None) segments
+        self._compiled_patterns = {
+            personality: [
+                tuple((literal, field) for literal, field, _, _ in Formatter().parse(pattern))
+                for pattern in patterns
+            ]
+            for personality, patterns in self._patterns.items()
+        }
+        # Placeholder names referenced by each pattern, so unused ones are never computed
+        self._pattern_fields = {
+            personality: [frozenset(field for _, field in segments if field) for segments in compiled]
+            for personality, compiled in self._compiled_patterns.items()
+        }
+        self._response_cache: Dict[tuple, str] = self._prerender_responses()
+        self._welcome = {p: t['welcome_message'] for p, t in self.personality_templates.items()}
+        self._closing = {p: t['closing_message'] for p, t in self.personality_templates.items()}
     
     def _load_personality_templates(self) -> Dict[str, Dict[str, Any]]:
         """Load personality templates based on research specifications"""
@@ -75,123 +220,75 @@ class PersonalityResponseGenerator:
                          user_response: str, step: int) -> str:
         """Generate personality-specific response to user input"""
 
-        template = self.personality_templates.get(personality, self.personality_templates['neutral'])
-        patterns = template['response_patterns']
+        # Interned so the cache-key and table lookups below compare by identity
+        personality = sys.intern(personality) if personality in _VALID_PERSONALITIES else 'neutral'
+        patterns = self._patterns[personality]
 
-        base_response = patterns[step % len(patterns)]
+        # The output depends only on these inputs, never on the user's text
+        category = sys.intern(question.get('category', ''))
+        index = step % len(patterns)
+        key = (personality, category, index, _step_bucket(step))
 
-        context = self._get_category_context(question.get('category', ''), personality)
-        category_context = self._get_category_specific_insight(question.get('category', ''), personality)
-        insight = self._get_step_insight(step, personality)
+        # Every key for a known category is prerendered; unknown categories are
+        # rendered on demand and not stored, so arbitrary input cannot grow the cache
+        response = self._response_cache.get(key)
+        if response is None:
+            response = self._render_response(personality, category, index, step)
+        return response
 
-        response = base_response.format(
-            context=context,
-            category_context=category_context,
-            insight=insight
-        )
+    def _prerender_responses(self) -> Dict[tuple, str]:
+        """Render every pattern for each known category and step bucket up front"""
+        categories = {''}.union(*CATEGORY_CONTEXTS.values(), *CATEGORY_INSIGHTS.values())
+        bucket_steps = (0, 5, 10)
+        return {
+            (personality, category, index, bucket): self._render_response(personality, category, index, step)
+            for personality, patterns in self._patterns.items()
+            for category in categories
+            for index in range(len(patterns))
+            for bucket, step in enumerate(bucket_steps)
+        }
 
-        return response
+    def _render_response(self, personality: str, category: str, index: int, step: int) -> str:
+        """Fill in the placeholders used by one response pattern"""
+        segments = self._compiled_patterns[personality][index]
+        fields = self._pattern_fields[personality][index]
 
-    def _get_category_context(self, category: str, personality: str) -> str:
-        """Get contextual information based on question category and personality"""
+        values = {}
+        if 'context' in fields:
+            values['context'] = self._get_category_context(category, personality)
+        if 'category_context' in fields:
+            values['category_context'] = self._get_category_specific_insight(category, personality)
+        if 'insight' in fields:
+            values['insight'] = self._get_step_insight(step, personality)
 
-        contexts = {
-            'neutral': {
-                'Situation/Trigger': 'Understanding the trigger is an important first step.',
-                'Thoughts': 'Identifying these thoughts is an important part of the process.',
-                'Emotions': 'Recognizing your emotional responses helps us understand your experience.',
-                'Behaviors': 'Understanding your behavioral responses provides insight into coping patterns.',
-                'Physical Reactions': 'Physical symptoms often reflect our mental state.',
-                'Cognitive Distortions': 'Recognizing thinking patterns is valuable for developing awareness.',
-                'Examine Evidence': 'This evaluation process helps develop balanced perspectives.',
-                'Balanced Thought': 'Creating alternative thoughts is a key CBT skill.',
-                'Action Planning': 'Planning concrete actions helps translate insights into practice.'
-            },
-            'conscientiousness': {
-                'Situation/Trigger': 'Systematic analysis of triggers provides crucial foundational data for our comprehensive examination.',
-                'Thoughts': 'Methodical identification of cognitive patterns enables thorough analysis of your thought processes.',
-                'Emotions': 'Precise emotional assessment is essential for comprehensive understanding of your affective responses.',
-                'Behaviors': 'Detailed behavioral analysis provides critical insights into your response patterns and coping mechanisms.',
-                'Physical Reactions': 'Systematic documentation of physiological responses enhances our comprehensive assessment.',
-                'Cognitive Distortions': 'Rigorous examination of thinking patterns is fundamental to evidence-based cognitive restructuring.',
-                'Examine Evidence': 'This systematic evaluation process is essential for developing well-founded, balanced perspectives.',
-                'Balanced Thought': 'Structured cognitive reframing represents a core evidence-based therapeutic technique.',
-                'Action Planning': 'Strategic action planning ensures systematic implementation of therapeutic insights.'
-            },
-            'extraversion': {
-                'Situation/Trigger': "I love that you're diving right into understanding what sparked these feelings!",
-                'Thoughts': 'This is so important - getting clear on these thoughts is going to be super helpful!',
-                'Emotions': "You're doing amazing work exploring these emotions - this is really valuable stuff!",
-                'Behaviors': "I'm so glad we're looking at this together - understanding your responses is incredibly insightful!",
-                'Physical Reactions': "This mind-body connection stuff is fascinating, and you're really getting it!",
-                'Cognitive Distortions': "You're being so brave examining these thinking patterns - this is powerful work!",
-                'Examine Evidence': "I love this part - we're like detectives uncovering the real story here!",
-                'Balanced Thought': "This is so exciting - you're building new, healthier ways of thinking!",
-                'Action Planning': "Yes! I'm thrilled we're moving into action mode - this is where the magic happens!"
-            }
-        }
+        return ''.join(literal + values[field] if field else literal for literal, field in segments)
 
-        return contexts.get(personality, contexts['neutral']).get(category, '')
+    def _get_category_context(self, category: str, personality: str) -> str:
+        """Get contextual information based on question category and personality"""
+        return _category_context(category, personality)
 
     def _get_category_specific_insight(self, category: str, personality: str) -> str:
         """Get category-specific insights based on personality"""
-
-        insights = {
-            'neutral': {
-                'Thoughts': 'Identifying these thoughts helps us understand your mental patterns.',
-                'Emotions': 'Understanding emotional responses is key to the CBT process.',
-                'Behaviors': 'Behavioral patterns often reflect our internal states.',
-                'Physical Reactions': 'The mind-body connection is an important aspect to explore.'
-            },
-            'conscientiousness': {
-                'Thoughts': 'Systematic thought identification enables comprehensive cognitive analysis.',
-                'Emotions': 'Methodical emotional assessment provides essential diagnostic clarity.',
-                'Behaviors': 'Structured behavioral analysis yields crucial therapeutic insights.',
-                'Physical Reactions': 'Systematic physiological assessment enhances diagnostic precision.'
-            },
-            'extraversion': {
-                'Thoughts': 'Getting clear on thoughts is so empowering!',
-                'Emotions': 'Understanding emotions is incredibly valuable for personal growth!',
-                'Behaviors': 'Exploring behaviors together is such meaningful work!',
-                'Physical Reactions': 'The mind-body connection is absolutely fascinating!'
-            }
-        }
-
-        return insights.get(personality, insights['neutral']).get(category, '')
+        return _category_insight(category, personality)
 
     def _get_step_insight(self, step: int, personality: str) -> str:
         """Get step-specific insights based on personality and progress"""
-
-        if personality == 'conscientiousness':
-            if step < 5:
-                return "This foundational information will inform our subsequent systematic analysis."
-            elif step < 10:
-                return "We're building a comprehensive understanding through methodical examination."
-            else:
-                return "This systematic approach ensures thorough therapeutic progress."
-        elif personality == 'extraversion':
-            if step < 5:
-                return "We're off to such a great start with this exploration!"
-            elif step < 10:
-                return "I'm loving how this is unfolding - you're doing fantastic work!"
-            else:
-                return "Look at all this amazing progress we're making together!"
-        else:
-            if step < 5:
-                return "This information helps build our understanding."
-            elif step < 10:
-                return "We're making good progress in this exploration."
-            else:
-                return "This reflection process is helping develop important insights."
+        return _step_insight(_step_bucket(step), personality)
 
     def get_welcome_message(self, personality: str) -> str:
         """Get personality-specific welcome message"""
-        return self.personality_templates[personality]['welcome_message']
+        if personality not in _VALID_PERSONALITIES:
+            personality = 'neutral'
+        return self._welcome[personality]
 
     def get_closing_message(self, personality: str) -> str:
         """Get personality-specific closing message"""
-        return self.personality_templates[personality]['closing_message']
+        if personality not in _VALID_PERSONALITIES:
+            personality = 'neutral'
+        return self._closing[personality]
 
     def get_personality_characteristics(self, personality: str) -> Dict[str, Any]:
         """Get personality characteristics for analysis"""
+        if personality not in _VALID_PERSONALITIES:
+            personality = 'neutral'
         return self.personality_templates[personality]['characteristics'] 
\ No newline at end of file
@@ -1,10 +1,10 @@
 import os
-import openai
-from typing import Dict, Any
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, Any, Optional
 
-# Load OpenAI API key from environment
-openai.api_key = os.getenv("OPENAI_API_KEY")
-OPENAI_ENABLED = bool(openai.api_key)
+# Only the environment is checked here; the app imports and configures openai itself
+OPENAI_ENABLED = bool(os.getenv("OPENAI_API_KEY"))
 #if not openai.api_key:
 #    raise RuntimeError("Missing OPENAI_API_KEY")
 if not OPENAI_ENABLED:
@@ -115,7 +115,7 @@ PERSONALITY_CONFIG = {
 CBT_CONFIG = {
     'stress': {
         'total_steps': 28,
-        'core_categories': [
+        'core_categories': (
             'Situation/Trigger',
             'Thoughts', 
             'Mood',
@@ -128,11 +128,11 @@ CBT_CONFIG = {
             'Deeper Beliefs',
             'Action Planning',
             'Healthier Beliefs'
-        ]
+        )
     },
     'anxiety': {
         'total_steps': 30,
-        'core_categories': [
+        'core_categories': (
             'Situation/Trigger',
             'Thoughts',
             'Emotions', 
@@ -148,11 +148,11 @@ CBT_CONFIG = {
             'Underlying Beliefs',
             'New Beliefs',
             'Progress'
-        ]
+        )
     },
     'lowMood': {
         'total_steps': 29,
-        'core_categories': [
+        'core_categories': (
             'Situation/Trigger',
             'Thoughts',
             'Moods',
@@ -168,10 +168,15 @@ CBT_CONFIG = {
             'Healthier Beliefs',
             'Small Wins',
             'Future Resilience'
-        ]
+        )
     }
 }
 
+# Hash sets alongside the ordered tuples for O(1) category membership checks
+for _condition_config in CBT_CONFIG.values():
+    _condition_config['core_categories_set'] = frozenset(_condition_config['core_categories'])
+del _condition_config
+
 # Research Metrics Configuration
 METRICS_CONFIG = {
     'response_quality': [
@@ -195,15 +200,42 @@ METRICS_CONFIG = {
     ]
 }
 
+def _freeze(obj: Any) -> Any:
+    """Recursively convert dicts to MappingProxyType and lists to tuples"""
+    if isinstance(obj, dict):
+        return MappingProxyType({key: _freeze(value) for key, value in obj.items()})
+    if isinstance(obj, (list, tuple)):
+        return tuple(_freeze(item) for item in obj)
+    return obj
+
+# Configuration is read-only after import, so every consumer can share one instance
+APP_CONFIG = _freeze(APP_CONFIG)
+PERSONALITY_CONFIG = _freeze(PERSONALITY_CONFIG)
+CBT_CONFIG = _freeze(CBT_CONFIG)
+METRICS_CONFIG = _freeze(METRICS_CONFIG)
+
+# Section name -> config, as looked up by get_config
+_CONFIGS_BY_NAME = {
+    'app': APP_CONFIG,
+    'personality': PERSONALITY_CONFIG,
+    'cbt': CBT_CONFIG,
+    'metrics': METRICS_CONFIG
+}
+
+# Configured file paths parsed once
+_PATHS: Dict[str, Path] = {key: Path(value) for key, value in APP_CONFIG['paths'].items()}
+
 def get_config(section: str = None) -> Dict[str, Any]:
     """Get configuration section or entire config"""
     if section:
-        return globals().get(f'{section.upper()}_CONFIG', {})
+        if section not in _CONFIGS_BY_NAME:
+            section = section.lower()
+        return _CONFIGS_BY_NAME.get(section, {})
     return APP_CONFIG
 
-def get_file_path(file_key: str) -> str:
-    """Get file path from configuration"""
-    return APP_CONFIG['paths'].get(file_key, '')
+def get_file_path(file_key: str) -> Optional[Path]:
+    """Get file path from configuration, or None for an unknown key"""
+    return _PATHS.get(file_key)
 
 def validate_config() -> bool:
     """Validate configuration completeness"""
@@ -5,19 +5,49 @@ Contains CBT flows and personality templates
 
 import json
 import os
-from typing import Dict, List, Any
+import sys
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Tuple
 
-def load_cbt_flows() -> Dict[str, List[Dict[str, str]]]:
-    """Load CBT flow questions from JSON file"""
+# orjson is optional; fall back to the stdlib parser when it is not installed
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    def _loads(data: bytes) -> Any:
+        return json.loads(data.decode('utf-8'))
+
+# String values that are used as lookup keys elsewhere (question ids, CBT categories)
+_INTERNED_VALUE_KEYS = frozenset(('id', 'category'))
+
+def _intern_keys(obj: Any) -> Any:
+    """Recursively intern dict keys and key-like string values of parsed JSON"""
+    if isinstance(obj, dict):
+        return {
+            sys.intern(key): (sys.intern(value) if key in _INTERNED_VALUE_KEYS and isinstance(value, str)
+                              else _intern_keys(value))
+            for key, value in obj.items()
+        }
+    if isinstance(obj, list):
+        return [_intern_keys(item) for item in obj]
+    return obj
+
+@lru_cache(maxsize=None)
+def load_cbt_flows() -> Mapping[str, Tuple[Dict[str, str], ...]]:
+    """Load CBT flow questions from JSON file (parsed once, shared read-only)"""
     file_path = os.path.join(os.path.dirname(__file__), 'cbt_flows.json')
-    with open(file_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    with open(file_path, 'rb') as f:
+        flows = _intern_keys(_loads(f.read()))
+    # Tuples so shared flows can't be reordered and slices stay JSON-serializable
+    return MappingProxyType({condition: tuple(flow) for condition, flow in flows.items()})
 
-def load_personality_templates() -> Dict[str, Dict[str, Any]]:
-    """Load personality templates from JSON file"""
+@lru_cache(maxsize=None)
+def load_personality_templates() -> Mapping[str, Dict[str, Any]]:
+    """Load personality templates from JSON file (parsed once, shared read-only)"""
     file_path = os.path.join(os.path.dirname(__file__), 'personality_templates.json')
-    with open(file_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    with open(file_path, 'rb') as f:
+        return MappingProxyType(_intern_keys(_loads(f.read())))
 
 # Export data loading functions
-__all__ = ['load_cbt_flows', 'load_personality_templates']
\ No newline at end of file
+__all__ = ['load_cbt_flows', 'load_personality_templates']
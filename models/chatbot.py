@@ -2,9 +2,14 @@
 CBT Chatbot model with personality-driven responses
 """
 
+import copy
 import json
 import os
-from typing import Dict, List, Any, Optional, Tuple
+import re
+from collections import deque
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, List, Any, Iterable, Mapping, Optional, Tuple
 from datetime import datetime
 
 from data import load_cbt_flows, load_personality_templates
@@ -12,12 +17,105 @@ from config.personalities import PersonalityResponseGenerator
 from utils.session_manager import SessionManager
 from utils.response_processor import ResponseProcessor
 
+# Personalities accepted by set_personality
+_ALLOWED_PERSONALITIES = frozenset(('neutral', 'conscientiousness', 'extraversion'))
+
+# Phrases counted as evidence for each therapeutic outcome
+OUTCOME_PHRASES = (
+    ('cognitive_restructuring_evidence', ('balanced', 'realistic', 'alternative', 'different way')),
+    ('emotional_processing_depth', ('feel', 'emotion', 'mood', 'feelings')),
+    ('behavioral_insights', ('behavior', 'action', 'react', 'response')),
+    ('self_awareness_growth', ('realize', 'understand', 'notice', 'pattern')),
+    ('coping_strategy_development', ('cope', 'manage', 'strategy', 'plan'))
+)
+
+# Bit i of an outcome mask stands for the i-th entry of OUTCOME_PHRASES
+_OUTCOME_BITS = {outcome: 1 << i for i, (outcome, _) in enumerate(OUTCOME_PHRASES)}
+_ALL_OUTCOMES_MASK = (1 << len(OUTCOME_PHRASES)) - 1
+
+# Single-word phrases per outcome bit; a whole-word hit settles that outcome without a scan
+_OUTCOME_WORDS = tuple(
+    (_OUTCOME_BITS[outcome], frozenset(phrase for phrase in phrases if ' ' not in phrase))
+    for outcome, phrases in OUTCOME_PHRASES
+)
+
+# One scan over a response finds every outcome it mentions; the lookahead lets
+# phrases overlap, and each match's lastgroup names the outcome it belongs to
+_OUTCOME_RE = re.compile('(?=%s)' % '|'.join(
+    '(?P<%s>%s)' % (outcome, '|'.join(map(re.escape, phrases)))
+    for outcome, phrases in OUTCOME_PHRASES
+))
+
+
+# Opening message for each condition, shown after the welcome message
+CONDITION_INTRODUCTIONS = {
+    'stress': "Great choice! Let's explore your stress using the CBT 5-Part Model. We'll examine how your situation, thoughts, emotions, behaviors, and physical reactions are all connected.",
+    'anxiety': "Perfect! We'll examine your anxiety using CBT's comprehensive framework. This will help us understand your fears and develop strategies to manage them effectively.",
+    'lowMood': "Excellent! Let's understand your low mood through the CBT 5-Part Model. We'll explore the connections between your thoughts, feelings, and behaviors to find pathways to feeling better."
+}
+
+
+@lru_cache(maxsize=1024)
+def _response_outcomes(response_lower: str) -> int:
+    """Bitmask of the outcomes mentioned in one lowercased response"""
+    tokens = set(response_lower.split())
+    mask = 0
+    for bit, words in _OUTCOME_WORDS:
+        if not words.isdisjoint(tokens):
+            mask |= bit
+    # Phrases can also appear inside longer words, so scan unless every outcome is settled,
+    # and stop the single left-to-right pass as soon as it is
+    if mask != _ALL_OUTCOMES_MASK:
+        for match in _OUTCOME_RE.finditer(response_lower):
+            mask |= _OUTCOME_BITS[match.lastgroup]
+            if mask == _ALL_OUTCOMES_MASK:
+                break
+    return mask
+
+
+def _score_outcomes(responses_lower: Iterable[str]) -> Dict[str, Any]:
+    """Percentage of lowercased responses mentioning each outcome, or {} for no responses"""
+    counts = [0] * len(OUTCOME_PHRASES)
+    total_responses = 0
+    for response_lower in responses_lower:
+        total_responses += 1
+        mask = _response_outcomes(response_lower)
+        for i in range(len(counts)):
+            counts[i] += (mask >> i) & 1
+    
+    if not total_responses:
+        return {}
+    return {
+        outcome: (count / total_responses) * 100
+        for (outcome, _), count in zip(OUTCOME_PHRASES, counts)
+    }
+
 
 class CBTChatbot:
     """Main chatbot class for CBT conversations"""
     
+    __slots__ = (
+        'cbt_flows',
+        '_flow_len',
+        'personality_templates',
+        'personality_generator',
+        'session_manager',
+        'response_processor',
+        'current_personality',
+        'current_condition',
+        'current_step',
+        'conversation_history',
+        'user_responses',
+        '_user_responses_lower',
+        '_user_turns',
+        '_bot_turns',
+        '_cached_summary'
+    )
+    
     def __init__(self):
         self.cbt_flows = load_cbt_flows()
+        # Number of questions per condition, fixed once the flows are loaded
+        self._flow_len = {condition: len(flow) for condition, flow in self.cbt_flows.items()}
         self.personality_templates = load_personality_templates()
         self.personality_generator = PersonalityResponseGenerator()
         self.session_manager = SessionManager()
@@ -26,13 +124,21 @@ class CBTChatbot:
         self.current_personality = 'neutral'
         self.current_condition = None
         self.current_step = 0
-        self.conversation_history = []
+        self.conversation_history = deque()
         self.user_responses = {}
+        self._user_responses_lower = {}
+        # Running per-type counts of conversation_history entries
+        self._user_turns = 0
+        self._bot_turns = 0
+        # Summary of a finished session, which can no longer change
+        self._cached_summary = None
         
     def set_personality(self, personality: str) -> bool:
         """Set the chatbot personality"""
-        if personality in ['neutral', 'conscientiousness', 'extraversion']:
+        if personality in _ALLOWED_PERSONALITIES:
             self.current_personality = personality
+            # The cached summary records the previous personality
+            self._cached_summary = None
             return True
         return False
     
@@ -43,8 +149,12 @@ class CBTChatbot:
         
         self.current_condition = condition
         self.current_step = 0
-        self.conversation_history = []
+        self.conversation_history = deque()
         self.user_responses = {}
+        self._user_responses_lower = {}
+        self._user_turns = 0
+        self._bot_turns = 0
+        self._cached_summary = None
         
         session_id = self.session_manager.create_session(
             self.current_personality, 
@@ -55,22 +165,29 @@ class CBTChatbot:
         condition_intro = self._get_condition_introduction(condition)
         first_question = self.get_current_question()
         
-        self.conversation_history.extend([
-            {'type': 'bot', 'message': welcome_msg, 'timestamp': datetime.now()},
-            {'type': 'bot', 'message': condition_intro, 'timestamp': datetime.now()},
-            {'type': 'bot', 'message': first_question['text'], 'timestamp': datetime.now()}
-        ])
+        now = datetime.now()
+        opening = (welcome_msg, condition_intro, first_question['text'])
+        self.conversation_history.extend(
+            {'type': 'bot', 'message': message, 'timestamp': now} for message in opening
+        )
+        self._bot_turns += len(opening)
         
         return True, f"Started {condition} session with {self.current_personality} personality"
     
+    def _append_history(self, entry: Dict[str, Any]):
+        """Append a conversation entry and keep the per-type counts current"""
+        self.conversation_history.append(entry)
+        if entry['type'] == 'user':
+            self._user_turns += 1
+        else:
+            self._bot_turns += 1
+    
     def _get_condition_introduction(self, condition: str) -> str:
         """Get introduction message for the condition"""
-        introductions = {
-            'stress': "Great choice! Let's explore your stress using the CBT 5-Part Model. We'll examine how your situation, thoughts, emotions, behaviors, and physical reactions are all connected.",
-            'anxiety': "Perfect! We'll examine your anxiety using CBT's comprehensive framework. This will help us understand your fears and develop strategies to manage them effectively.",
-            'lowMood': "Excellent! Let's understand your low mood through the CBT 5-Part Model. We'll explore the connections between your thoughts, feelings, and behaviors to find pathways to feeling better."
-        }
-        return introductions.get(condition, f"Let's begin exploring your {condition} using CBT techniques.")
+        intro = CONDITION_INTRODUCTIONS.get(condition)
+        if intro is None:
+            intro = f"Let's begin exploring your {condition} using CBT techniques."
+        return intro
     
     def process_user_response(self, user_input: str) -> Tuple[bool, str, bool]:
         """Process user response and return (success, bot_response, session_complete)"""
@@ -83,12 +200,15 @@ class CBTChatbot:
             return False, "Session error: No current question found.", False
         
         self.user_responses[current_question['id']] = user_input
+        self._user_responses_lower[current_question['id']] = user_input.lower()
+        # One timestamp for every history entry this turn produces
+        now = datetime.now()
         
-        self.conversation_history.append({
+        self._append_history({
             'type': 'user',
             'message': user_input,
             'question_id': current_question['id'],
-            'timestamp': datetime.now()
+            'timestamp': now
         })
         
         self.session_manager.add_response(
@@ -105,31 +225,31 @@ class CBTChatbot:
             self.current_step
         )
         
-        self.conversation_history.append({
+        self._append_history({
             'type': 'bot',
             'message': bot_response,
-            'timestamp': datetime.now()
+            'timestamp': now
         })
         
         self.current_step += 1
         
-        is_complete = self.current_step >= len(self.cbt_flows[self.current_condition])
+        is_complete = self.current_step >= self._flow_len[self.current_condition]
         
         if not is_complete:
             next_question = self.get_current_question()
             if next_question:
-                self.conversation_history.append({
+                self._append_history({
                     'type': 'bot',
                     'message': next_question['text'],
-                    'timestamp': datetime.now()
+                    'timestamp': now
                 })
                 bot_response += f"\n\n{next_question['text']}"
         else:
             completion_message = "You've completed the CBT reflection process! This is a significant accomplishment. Would you like me to generate a journal summary of your session?"
-            self.conversation_history.append({
+            self._append_history({
                 'type': 'bot',
                 'message': completion_message,
-                'timestamp': datetime.now()
+                'timestamp': now
             })
             bot_response += f"\n\n{completion_message}"
         
@@ -137,14 +257,14 @@ class CBTChatbot:
     
     def get_current_question(self) -> Optional[Dict[str, str]]:
         """Get the current question based on session state"""
-        if not self.current_condition or self.current_step >= len(self.cbt_flows[self.current_condition]):
+        if not self.current_condition:
             return None
         
-        return self.cbt_flows[self.current_condition][self.current_step]
+        return self.get_question(self.current_condition, self.current_step)
     
     def get_question(self, condition: str, step: int) -> Optional[Dict[str, str]]:
         """Get a specific question by condition and step"""
-        if condition not in self.cbt_flows or step >= len(self.cbt_flows[condition]):
+        if step >= self._flow_len.get(condition, 0):
             return None
         
         return self.cbt_flows[condition][step]
@@ -154,7 +274,10 @@ class CBTChatbot:
         if not self.current_condition:
             return {}
         
-        total_questions = len(self.cbt_flows[self.current_condition])
+        return self._build_progress(self._flow_len[self.current_condition])
+    
+    def _build_progress(self, total_questions: int) -> Dict[str, Any]:
+        """Progress information for the current session out of total_questions"""
         progress_percentage = (self.current_step / total_questions) * 100
         
         return {
@@ -167,20 +290,24 @@ class CBTChatbot:
             'session_complete': self.current_step >= total_questions
         }
     
-    def get_conversation_history(self) -> List[Dict[str, Any]]:
-        """Get the conversation history"""
-        return self.conversation_history.copy()
+    def get_conversation_history(self) -> Tuple[Dict[str, Any], ...]:
+        """Get a read-only snapshot of the conversation history"""
+        return tuple(self.conversation_history)
     
-    def get_user_responses(self) -> Dict[str, str]:
-        """Get all user responses"""
-        return self.user_responses.copy()
+    def get_user_responses(self) -> Mapping[str, str]:
+        """Get a read-only view of all user responses"""
+        return MappingProxyType(self.user_responses)
     
     def generate_session_summary(self) -> Dict[str, Any]:
         """Generate a comprehensive session summary"""
         if not self.current_condition:
             return {}
+        # Callers get their own copy, so changing one summary cannot alter later ones
+        if self._cached_summary is not None:
+            return copy.deepcopy(self._cached_summary)
         
         session_data = self.session_manager.complete_session()
+        progress = self._build_progress(self._flow_len[self.current_condition])
         
         response_analytics = self.response_processor.export_response_analytics(
             self.user_responses,
@@ -194,12 +321,12 @@ class CBTChatbot:
                 'personality': self.current_personality,
                 'start_time': self.conversation_history[0]['timestamp'] if self.conversation_history else None,
                 'end_time': datetime.now(),
-                'completion_status': 'complete' if self.current_step >= len(self.cbt_flows[self.current_condition]) else 'incomplete'
+                'completion_status': 'complete' if progress['session_complete'] else 'incomplete'
             },
-            'progress_metrics': self.get_session_progress(),
+            'progress_metrics': progress,
             'conversation_analysis': {
-                'total_exchanges': len([h for h in self.conversation_history if h['type'] == 'user']),
-                'total_bot_responses': len([h for h in self.conversation_history if h['type'] == 'bot']),
+                'total_exchanges': self._user_turns,
+                'total_bot_responses': self._bot_turns,
                 'conversation_length': len(self.conversation_history)
             },
             'response_analytics': response_analytics,
@@ -207,51 +334,34 @@ class CBTChatbot:
             'therapeutic_outcomes': self._assess_therapeutic_outcomes()
         }
         
+        # Responses stop arriving once every question is answered, so later
+        # exports reuse this summary instead of re-completing the session
+        if summary['session_metadata']['completion_status'] == 'complete':
+            self._cached_summary = copy.deepcopy(summary)
         return summary
     
     def _assess_therapeutic_outcomes(self) -> Dict[str, Any]:
         """Assess therapeutic outcomes based on response patterns"""
-        if not self.user_responses:
-            return {}
-        
-        outcomes = {
-            'cognitive_restructuring_evidence': 0,
-            'emotional_processing_depth': 0,
-            'behavioral_insights': 0,
-            'self_awareness_growth': 0,
-            'coping_strategy_development': 0
-        }
-        
-        for response_text in self.user_responses.values():
-            response_lower = response_text.lower()
-            
-            if any(phrase in response_lower for phrase in ['balanced', 'realistic', 'alternative', 'different way']):
-                outcomes['cognitive_restructuring_evidence'] += 1
-            
-            if any(phrase in response_lower for phrase in ['feel', 'emotion', 'mood', 'feelings']):
-                outcomes['emotional_processing_depth'] += 1
-            
-            if any(phrase in response_lower for phrase in ['behavior', 'action', 'react', 'response']):
-                outcomes['behavioral_insights'] += 1
-            
-            if any(phrase in response_lower for phrase in ['realize', 'understand', 'notice', 'pattern']):
-                outcomes['self_awareness_growth'] += 1
-            
-            if any(phrase in response_lower for phrase in ['cope', 'manage', 'strategy', 'plan']):
-                outcomes['coping_strategy_development'] += 1
-        
-        total_responses = len(self.user_responses)
-        for key in outcomes:
-            outcomes[key] = (outcomes[key] / total_responses) * 100 if total_responses > 0 else 0
-        
-        return outcomes
+        return _score_outcomes(self._user_responses_lower.values())
+    
+    @staticmethod
+    def batch_assess(responses_list: List[Mapping[str, str]]) -> List[Dict[str, Any]]:
+        """Assess therapeutic outcomes for many sessions' responses, e.g. from exports"""
+        return [
+            _score_outcomes(response_text.lower() for response_text in responses.values())
+            for responses in responses_list
+        ]
     
     def reset_session(self):
         """Reset the current session"""
         self.current_condition = None
         self.current_step = 0
-        self.conversation_history = []
+        self.conversation_history = deque()
         self.user_responses = {}
+        self._user_responses_lower = {}
+        self._user_turns = 0
+        self._bot_turns = 0
+        self._cached_summary = None
         self.session_manager.clear_session_data()
     
     def switch_condition(self, new_condition: str) -> Tuple[bool, str]:
@@ -259,7 +369,8 @@ class CBTChatbot:
         if new_condition not in self.cbt_flows:
             return False, f"Unknown condition: {new_condition}"
         
-        if self.current_condition and self.user_responses:
+        # A cached summary means complete_session already ran for this session
+        if self.current_condition and self.user_responses and self._cached_summary is None:
             self.session_manager.complete_session()
         
         return self.start_session(new_condition)
@@ -281,13 +392,13 @@ class CBTChatbot:
         return {
             'session_summary': self.generate_session_summary(),
             'conversation_history': self.get_conversation_history(),
-            'user_responses': self.get_user_responses(),
+            # A plain dict so the export stays JSON-serializable
+            'user_responses': dict(self.user_responses),
             'cbt_flow_data': {
                 'condition': self.current_condition,
-                'questions_asked': [
-                    self.cbt_flows[self.current_condition][i] 
-                    for i in range(min(self.current_step, len(self.cbt_flows[self.current_condition])))
-                ] if self.current_condition else []
+                # Slicing clamps to the flow length on its own
+                'questions_asked': self.cbt_flows[self.current_condition][:self.current_step]
+                if self.current_condition else []
             },
             'personality_data': {
                 'current_personality': self.current_personality,
@@ -0,0 +1,15 @@
+import pytest
+
+for _module in ('streamlit', 'openai', 'pandas', 'textblob'):
+    pytest.importorskip(_module)
+
+from app_simple import _fallback_keywords
+
+
+def test_fallback_keywords_match_strip_and_isalpha_filter():
+    assert _fallback_keywords('Work, work! Stress... and sleep tonight') == 'work, stress, sleep'
+
+
+def test_fallback_keywords_skip_numeric_letter_tokens():
+    # '½' and '²' are numeric but not decimal, so a [^\W\d_] class would accept them
+    assert _fallback_keywords('½half x²yz Ⅻabc well-being calm quiet') == 'calm, quiet'
@@ -0,0 +1,32 @@
+import importlib.util
+import os
+
+import pytest
+
+pytest.importorskip('streamlit')
+
+# Loaded from its path: the utils package __init__ pulls in every utility module
+_PATH = os.path.join(os.path.dirname(__file__), os.pardir, 'utils', 'response_processor.py')
+_spec = importlib.util.spec_from_file_location('response_processor', _PATH)
+response_processor = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(response_processor)
+
+
+def _naive_present(response_lower):
+    return {p for p in response_processor._PHRASE_MASKS if p in response_lower}
+
+
+@pytest.mark.parametrize('response', [
+    'i feel',
+    'feel',
+    'feeling',
+    'i feel like feeling better made me feel calm',
+    'this is due to work, which could lead to stress',
+    'which leads to more worry because of the deadline',
+    'I FEEL ANXIOUS DUE TO EXAMS, WHICH LEADS TO POOR SLEEP'.lower(),
+    'i was tired\nfeeling low\ndue to\nlead to\nit feels heavy',
+    'unfeelingly',
+    '',
+])
+def test_present_phrases_match_substring_scan(response):
+    assert response_processor._present_phrases(response) == _naive_present(response)
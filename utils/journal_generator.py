@@ -2,25 +2,104 @@
 Journal generation utilities for CBT Chatbot Research System
 """
 
-import json
+import re
+import sys
 from datetime import datetime
-from typing import Dict, List, Any, Optional
-from collections import defaultdict
+from types import MappingProxyType
+from typing import Dict, List, Any, Iterable, Tuple
 
 
-class JournalGenerator:
-    """Generates structured journal entries from CBT session data"""
-    
-    def __init__(self):
-        self.condition_templates = self._load_condition_templates()
-        
-    def _load_condition_templates(self) -> Dict[str, Dict[str, str]]:
-        """Load journal templates for different conditions"""
-        return {
-            'stress': {
-                'title': 'Stress Management CBT Session',
-                'intro': 'This session explored stress triggers and coping strategies using the CBT 5-Part Model.',
-                'summary_template': """You recently experienced a stressful situation involving {situation}, which triggered feelings of {emotions}. At the time, you thought: "{hot_thought}," which contributed to your distress. This thought was linked to underlying assumptions and influenced by thinking patterns like {distortions}.
+# Markdown templates for the journal, built once at import and filled with str.format
+_HEADER_TEMPLATE = """# {title}
+
+**Session Date:** {session_date}
+**Condition Focus:** {condition_name}
+**Chatbot Personality:** {personality_name}
+**Session Type:** Cognitive Behavioral Therapy (CBT) Journaling
+
+---
+
+## Session Overview
+
+{intro}
+
+---
+
+"""
+
+_STRESS_SUMMARY_TEMPLATE = """Through this CBT exploration, you examined a stressful experience involving **{situation}**. Your most distressing thought was: *"{hot_thought}"*, which contributed to feelings of **{emotions}** and led to behaviors such as **{behaviors}**.
+
+Physically, you experienced **{physical}**, demonstrating the mind-body connection in stress responses.
+
+By examining the evidence and challenging unhelpful thinking patterns, you developed a more balanced perspective: *"{balanced_thought}"*. You also identified a new, empowering belief: *"{new_belief}"* and committed to taking action through **{helpful_action}**.
+
+This reflection demonstrates that stress involves not just external events, but how we interpret and respond to them. You've gained valuable insights for managing future stressful situations more effectively."""
+
+_ANXIETY_SUMMARY_TEMPLATE = """This session explored your anxiety around **{situation}**, with your core fear being **{fear}**. Your most distressing thought was: *"{hot_thought}"*, which triggered **{emotions}** and led to behaviors like **{behaviors}**.
+
+You experienced physical symptoms including **{physical}**, highlighting anxiety's impact on the body.
+
+Through evidence examination, you developed a more balanced perspective: *"{balanced_thought}"*. You're working toward the empowering belief that *"{new_belief}"* and have committed to taking a small step forward: **{small_step}**.
+
+This process reveals that anxiety often involves overestimating danger while underestimating your coping abilities. You have more resilience and capability than your anxious mind suggests."""
+
+_LOW_MOOD_SUMMARY_TEMPLATE = """Your low mood was triggered by **{trigger}**, leading to the painful thought: *"{hot_thought}"*. This contributed to feelings of **{emotions}** and behaviors such as **{behaviors}**.
+
+You also noticed physical symptoms like **{physical}**, showing how mood affects the entire body.
+
+Through compassionate self-examination, you developed a more balanced perspective: *"{balanced_perspective}"*. You're cultivating the healthier belief that *"{new_belief}"* and have planned to engage in **{tomorrow_activity}** to support your mood.
+
+This reflection shows that depression often involves a harsh inner critic. By challenging these thoughts and planning positive activities, you're taking meaningful steps toward self-compassion and recovery."""
+
+_REFLECTION_INTRO = """## Key Insights and Reflections
+
+Through this CBT journaling process, several important patterns and insights emerged:
+
+### Thought-Emotion-Behavior Connection
+This session highlighted the interconnected nature of thoughts, emotions, and behaviors. By identifying and examining automatic thoughts, you gained awareness of how cognitive patterns influence your emotional and behavioral responses.
+
+### Evidence-Based Thinking
+You practiced evaluating thoughts objectively, considering both supporting and contradicting evidence. This skill helps develop more balanced, realistic perspectives rather than accepting thoughts at face value.
+
+### Cognitive Restructuring
+You successfully challenged unhelpful thinking patterns and developed more adaptive, compassionate ways of viewing yourself and your situation.
+
+### Actionable Insights
+You identified concrete steps you can take to apply these insights in daily life, moving from reflection to practical implementation.
+
+---
+
+"""
+
+_FOOTER_TEMPLATE = """## Final Reflection
+
+{message}
+
+### Next Steps
+1. **Review** this journal entry regularly to reinforce insights
+2. **Practice** the balanced thoughts and coping strategies identified
+3. **Implement** the action steps you've committed to
+4. **Monitor** your progress and celebrate small wins
+5. **Return** to these techniques when facing similar challenges
+
+### Session Completion
+**Date:** {completion_date}
+**Duration:** CBT Therapeutic Writing Session
+**Focus:** Cognitive restructuring and insight development
+
+---
+
+*This journal entry was generated from your CBT session responses and serves as a personal reference for ongoing mental health support. Keep this record for future reflection and progress tracking.*"""
+
+# The whole journal: header, the cached body, then the footer
+_JOURNAL_TEMPLATE = _HEADER_TEMPLATE + '{body}' + _FOOTER_TEMPLATE
+
+# Per-condition journal templates, shared read-only by every JournalGenerator
+CONDITION_TEMPLATES = MappingProxyType({
+    'stress': {
+        'title': 'Stress Management CBT Session',
+        'intro': 'This session explored stress triggers and coping strategies using the CBT 5-Part Model.',
+        'summary_template': """You recently experienced a stressful situation involving {situation}, which triggered feelings of {emotions}. At the time, you thought: "{hot_thought}," which contributed to your distress. This thought was linked to underlying assumptions and influenced by thinking patterns like {distortions}.
 
 Emotionally, this led to {emotions}, and behaviorally, you responded with {behaviors}. Physically, your body reacted with {physical_symptoms}, highlighting the stress-body connection.
 
@@ -31,11 +110,11 @@ A deeper belief surfaced during this process: {deeper_belief}. You identified a
 As a next step, you committed to {action_plan} and identified coping strategies. Recognizing what's within your control enables a shift toward healthier responses.
 
 This reflection shows that stress is not just about events, but how we interpret and respond to them. You've taken meaningful steps toward breaking the stress cycle."""
-            },
-            'anxiety': {
-                'title': 'Anxiety Management CBT Session',
-                'intro': 'This session examined anxious thoughts and developed confidence-building strategies.',
-                'summary_template': """You experienced anxiety related to {situation}, with the core fear being {fear}. Your most distressing thought was: "{hot_thought}," which predicted {predictions}.
+    },
+    'anxiety': {
+        'title': 'Anxiety Management CBT Session',
+        'intro': 'This session examined anxious thoughts and developed confidence-building strategies.',
+        'summary_template': """You experienced anxiety related to {situation}, with the core fear being {fear}. Your most distressing thought was: "{hot_thought}," which predicted {predictions}.
 
 This anxiety manifested emotionally as {emotions} (rated {intensity}/100), led to behaviors like {behaviors}, and created physical symptoms including {physical_symptoms}.
 
@@ -48,11 +127,11 @@ A deeper belief contributing to your anxiety was: {deeper_belief}. You're workin
 Key learning: {key_learning}. Your commitment for this week: {weekly_action}.
 
 Remember: anxiety often involves overestimating danger and underestimating your ability to cope. You have more resilience than your anxious mind suggests."""
-            },
-            'lowMood': {
-                'title': 'Low Mood Recovery CBT Session', 
-                'intro': 'This session addressed negative thoughts and focused on rebuilding positive momentum.',
-                'summary_template': """Your low mood was triggered by {trigger}, leading to the painful thought: "{hot_thought}." This thought meant {meaning} to you about yourself, your life, or your future.
+    },
+    'lowMood': {
+        'title': 'Low Mood Recovery CBT Session', 
+        'intro': 'This session addressed negative thoughts and focused on rebuilding positive momentum.',
+        'summary_template': """Your low mood was triggered by {trigger}, leading to the painful thought: "{hot_thought}." This thought meant {meaning} to you about yourself, your life, or your future.
 
 Emotionally, you experienced {emotions} (rated {mood_rating}/100). Behaviorally, you {behaviors}, which may have included withdrawal or reduced activity. Physically, you noticed {physical_symptoms}.
 
@@ -67,241 +146,290 @@ A core belief contributing to your low mood was: {deep_belief}. You're developin
 Your 24-hour commitment: {next_24_hours}. Support available: {support}. Future reminder: {future_reminder}.
 
 Remember: depression often involves a harsh inner critic. You've shown courage by challenging these thoughts and taking steps toward self-compassion and renewed activity."""
-            }
+    }
+})
+
+# Display names used in the journal header
+CONDITION_NAMES = {
+    'stress': 'Stress',
+    'anxiety': 'Anxiety',
+    'lowMood': 'Low Mood'
+}
+
+PERSONALITY_NAMES = {
+    'neutral': 'Neutral',
+    'conscientiousness': 'High Conscientiousness',
+    'extraversion': 'High Extraversion'
+}
+
+# Closing encouragement per chatbot personality
+FOOTER_MESSAGES = {
+    'neutral': "Remember that CBT is a process of ongoing practice. The insights gained today provide a foundation for continued growth and self-understanding.",
+    
+    'conscientiousness': "Your systematic approach to this CBT process demonstrates excellent commitment to personal development. Consistent application of these evidence-based techniques will yield significant long-term benefits for your mental health and wellbeing.",
+    
+    'extraversion': "What an amazing journey of self-discovery you've completed today! Your openness and courage in exploring these thoughts and feelings is truly inspiring. Remember, every small step counts, and you're building something really meaningful for your mental health! 🌟"
+}
+
+# (response key, fallback text) pairs that fill each condition's summary
+KEY_RESPONSE_DEFAULTS = {
+    'stress': (
+        ('situation', 'a challenging situation'),
+        ('hot_thought', 'a distressing thought'),
+        ('emotions', 'difficult emotions'),
+        ('behaviors', 'stress responses'),
+        ('physical', 'physical symptoms'),
+        ('balanced_thought', 'a more balanced perspective'),
+        ('new_belief', 'a healthier belief'),
+        ('helpful_action', 'positive action steps')
+    ),
+    'anxiety': (
+        ('situation', 'an anxiety-provoking situation'),
+        ('hot_thought', 'an anxious thought'),
+        ('fear', 'a specific fear'),
+        ('emotions', 'anxious feelings'),
+        ('behaviors', 'anxiety responses'),
+        ('physical', 'physical anxiety symptoms'),
+        ('balanced_thought', 'a more realistic perspective'),
+        ('new_belief', 'an empowering belief'),
+        ('small_step', 'a gradual exposure step')
+    ),
+    'lowMood': (
+        ('trigger', 'a mood trigger'),
+        ('hot_thought', 'a painful thought'),
+        ('emotions', 'low mood feelings'),
+        ('behaviors', 'mood-related behaviors'),
+        ('physical', 'physical symptoms'),
+        ('balanced_perspective', 'a compassionate perspective'),
+        ('new_belief', 'a healthier self-belief'),
+        ('tomorrow_activity', 'a mood-lifting activity')
+    )
+}
+
+
+def _make_key_extractor(pairs):
+    """Build a function that fills one condition's summary keys from the responses"""
+    def extract(responses: Dict[str, str]) -> Dict[str, str]:
+        get = responses.get
+        return {key: get(key, default) for key, default in pairs}
+    return extract
+
+
+# Summary key extractor per condition, so a call is one lookup plus one comprehension
+_KEY_EXTRACTORS = {condition: _make_key_extractor(pairs) for condition, pairs in KEY_RESPONSE_DEFAULTS.items()}
+
+
+# Response keys holding the committed action, in order of preference
+ACTION_KEYS = ('helpful_action', 'small_step', 'tomorrow_activity')
+
+# Rendered journal bodies kept per generator, oldest evicted first
+JOURNAL_CACHE_SIZE = 128
+
+# Responses expected for a complete session of each condition
+EXPECTED_RESPONSE_COUNTS = {'stress': 28, 'anxiety': 30, 'lowMood': 29}
+
+# Keywords whose presence anywhere in a session marks a therapeutic theme
+THEME_KEYWORDS = {
+    'self_compassion': ['kind to myself', 'self-care', 'forgive myself', 'compassion'],
+    'cognitive_restructuring': ['balanced thought', 'realistic', 'evidence', 'challenge'],
+    'behavioral_activation': ['activity', 'action', 'do something', 'engage'],
+    'mindfulness': ['present', 'aware', 'notice', 'mindful'],
+    'coping_strategies': ['cope', 'manage', 'strategy', 'technique'],
+    'support_seeking': ['support', 'help', 'friend', 'family']
+}
+
+# All theme keywords in one pass; the lookahead lets keywords overlap and
+# each match's lastgroup names its theme
+_THEME_RE = re.compile('(?=%s)' % '|'.join(
+    '(?P<%s>%s)' % (theme, '|'.join(map(re.escape, keywords)))
+    for theme, keywords in THEME_KEYWORDS.items()
+))
+
+# Words that indicate insight; each one present in a response counts once
+INSIGHT_KEYWORDS = ('realize', 'understand', 'insight', 'pattern', 'connection', 'because')
+
+_INSIGHT_RE = re.compile('(?=(%s))' % '|'.join(map(re.escape, INSIGHT_KEYWORDS)))
+
+
+def _word_count(text: str) -> int:
+    """Same result as len(text.split()), without building the word list when possible"""
+    # Printable text has no whitespace but ' ', so single-spaced, trimmed text has one more word than spaces
+    if text.isprintable() and '  ' not in text and text[:1] != ' ' and text[-1:] != ' ':
+        return text.count(' ') + 1 if text else 0
+    return len(text.split())
+
+
+def _count_insights(response_lower: str) -> int:
+    """Number of distinct insight keywords in one lowercased response"""
+    return len({match.group(1) for match in _INSIGHT_RE.finditer(response_lower)})
+
+
+class JournalGenerator:
+    """Generates structured journal entries from CBT session data"""
+    
+    def __init__(self):
+        self.condition_templates = self._load_condition_templates()
+        # (condition, response items) -> (flow questions, rendered body)
+        self._body_cache: Dict[tuple, tuple] = {}
+        self._summary_builders = {
+            'stress': self._create_stress_summary,
+            'anxiety': self._create_anxiety_summary,
+            'lowMood': self._create_low_mood_summary
         }
+        
+    def _load_condition_templates(self) -> Dict[str, Dict[str, str]]:
+        """Load journal templates for different conditions"""
+        return CONDITION_TEMPLATES
     
     def create_journal(self, condition: str, personality: str, 
                       responses: Dict[str, str], chatbot: Any) -> str:
         """Create a complete journal entry from session responses"""
         
-        template = self.condition_templates.get(condition, self.condition_templates['stress'])
+        # One clock read so the header and footer agree
+        now = datetime.now()
+        return self._render_journal(condition, personality, responses, chatbot,
+                                    now.strftime('%B %d, %Y at %I:%M %p'), now.strftime('%B %d, %Y'))
+    
+    def create_journals(self, batch: List[Tuple[str, str, Dict[str, str]]], chatbot: Any) -> List[str]:
+        """Create journal entries for many (condition, personality, responses) sessions at once"""
+        
+        # The whole batch shares one timestamp
+        now = datetime.now()
+        session_date = now.strftime('%B %d, %Y at %I:%M %p')
+        completion_date = now.strftime('%B %d, %Y')
+        return [
+            self._render_journal(condition, personality, responses, chatbot, session_date, completion_date)
+            for condition, personality, responses in batch
+        ]
+    
+    def _render_journal(self, condition: str, personality: str, responses: Dict[str, str],
+                        chatbot: Any, session_date: str, completion_date: str) -> str:
+        """Fill the journal template for one session"""
         
-        journal = self._generate_header(condition, personality, template)
-        journal += self._generate_sections(condition, responses, chatbot)
-        journal += self._generate_summary(condition, responses, template)
-        journal += self._generate_reflection_section(responses)
-        journal += self._generate_footer(personality)
+        # Interned so the table lookups and cache keys below compare by identity
+        condition = sys.intern(condition)
+        personality = sys.intern(personality)
+        template = self.condition_templates.get(condition, self.condition_templates['stress'])
         
-        return journal
+        return _JOURNAL_TEMPLATE.format(
+            title=template['title'],
+            session_date=session_date,
+            condition_name=CONDITION_NAMES.get(condition, condition.title()),
+            personality_name=PERSONALITY_NAMES.get(personality, personality.title()),
+            intro=template['intro'],
+            body=self._generate_body(condition, responses, chatbot, template),
+            message=FOOTER_MESSAGES.get(personality, FOOTER_MESSAGES['neutral']),
+            completion_date=completion_date
+        )
     
-    def _generate_header(self, condition: str, personality: str, template: Dict[str, str]) -> str:
-        """Generate journal header with metadata"""
-        condition_names = {
-            'stress': 'Stress',
-            'anxiety': 'Anxiety', 
-            'lowMood': 'Low Mood'
-        }
+    def _generate_body(self, condition: str, responses: Dict[str, str], chatbot: Any,
+                       template: Dict[str, str]) -> str:
+        """Generate the timestamp-free middle of the journal, reusing earlier renders"""
         
-        personality_names = {
-            'neutral': 'Neutral',
-            'conscientiousness': 'High Conscientiousness',
-            'extraversion': 'High Extraversion'
-        }
+        # Only the header and footer carry the clock, so the body is a pure
+        # function of the condition, the responses and the question flow
+        questions = chatbot.cbt_flows[condition]
+        key = (condition, frozenset(responses.items()))
+        cached = self._body_cache.get(key)
+        if cached is not None and cached[0] is questions:
+            return cached[1]
         
-        header = f"""# {template['title']}
-
-**Session Date:** {datetime.now().strftime('%B %d, %Y at %I:%M %p')}
-**Condition Focus:** {condition_names.get(condition, condition.title())}
-**Chatbot Personality:** {personality_names.get(personality, personality.title())}
-**Session Type:** Cognitive Behavioral Therapy (CBT) Journaling
-
----
-
-## Session Overview
-
-{template['intro']}
-
----
-
-"""
-        return header
+        body = ''.join((
+            self._generate_sections(condition, responses, chatbot),
+            self._generate_summary(condition, responses, template),
+            self._generate_reflection_section(responses)
+        ))
+        
+        if len(self._body_cache) >= JOURNAL_CACHE_SIZE:
+            del self._body_cache[next(iter(self._body_cache))]
+        self._body_cache[key] = (questions, body)
+        return body
     
     def _generate_sections(self, condition: str, responses: Dict[str, str], chatbot: Any) -> str:
         """Generate organized sections based on CBT categories"""
         
         questions = chatbot.cbt_flows[condition]
         
-        categories = defaultdict(list)
+        categories = {}
         for question in questions:
-            if question['id'] in responses:
-                categories[question['category']].append({
+            answer = responses.get(question['id'])
+            if answer is not None:
+                categories.setdefault(question['category'], []).append({
                     'question': question['text'],
-                    'answer': responses[question['id']],
+                    'answer': answer,
                     'id': question['id']
                 })
         
-        sections_content = ""
+        parts = []
         
         for category, items in categories.items():
-            sections_content += f"## {category}\n\n"
+            parts.append(f"## {category}\n\n")
             
             for item in items:
-                sections_content += f"**Q:** {item['question']}\n\n"
-                sections_content += f"**A:** {item['answer']}\n\n"
+                parts.append(f"**Q:** {item['question']}\n\n**A:** {item['answer']}\n\n")
             
-            sections_content += "---\n\n"
+            parts.append("---\n\n")
         
-        return sections_content
+        return ''.join(parts)
     
     def _generate_summary(self, condition: str, responses: Dict[str, str], template: Dict[str, str]) -> str:
         """Generate narrative summary of the session"""
         
-        summary_content = "## Session Summary\n\n"
+        builder = self._summary_builders.get(condition)
+        if builder is None:
+            return "## Session Summary\n\n\n---\n\n"
         
         key_responses = self._extract_key_responses(condition, responses)
-        
-        if condition == 'stress':
-            summary_content += self._create_stress_summary(key_responses)
-        elif condition == 'anxiety':
-            summary_content += self._create_anxiety_summary(key_responses)
-        elif condition == 'lowMood':
-            summary_content += self._create_low_mood_summary(key_responses)
-        
-        summary_content += "\n---\n\n"
-        
-        return summary_content
+        return f"## Session Summary\n\n{builder(key_responses)}\n---\n\n"
     
     def _extract_key_responses(self, condition: str, responses: Dict[str, str]) -> Dict[str, str]:
         """Extract key responses for summary generation"""
         
-        key_mappings = {
-            'stress': {
-                'situation': responses.get('situation', 'a challenging situation'),
-                'hot_thought': responses.get('hot_thought', 'a distressing thought'),
-                'emotions': responses.get('emotions', 'difficult emotions'),
-                'behaviors': responses.get('behaviors', 'stress responses'),
-                'physical': responses.get('physical', 'physical symptoms'),
-                'balanced_thought': responses.get('balanced_thought', 'a more balanced perspective'),
-                'new_belief': responses.get('new_belief', 'a healthier belief'),
-                'helpful_action': responses.get('helpful_action', 'positive action steps')
-            },
-            'anxiety': {
-                'situation': responses.get('situation', 'an anxiety-provoking situation'),
-                'hot_thought': responses.get('hot_thought', 'an anxious thought'),
-                'fear': responses.get('fear', 'a specific fear'),
-                'emotions': responses.get('emotions', 'anxious feelings'),
-                'behaviors': responses.get('behaviors', 'anxiety responses'),
-                'physical': responses.get('physical', 'physical anxiety symptoms'),
-                'balanced_thought': responses.get('balanced_thought', 'a more realistic perspective'),
-                'new_belief': responses.get('new_belief', 'an empowering belief'),
-                'small_step': responses.get('small_step', 'a gradual exposure step')
-            },
-            'lowMood': {
-                'trigger': responses.get('trigger', 'a mood trigger'),
-                'hot_thought': responses.get('hot_thought', 'a painful thought'),
-                'emotions': responses.get('emotions', 'low mood feelings'),
-                'behaviors': responses.get('behaviors', 'mood-related behaviors'),
-                'physical': responses.get('physical', 'physical symptoms'),
-                'balanced_perspective': responses.get('balanced_perspective', 'a compassionate perspective'),
-                'new_belief': responses.get('new_belief', 'a healthier self-belief'),
-                'tomorrow_activity': responses.get('tomorrow_activity', 'a mood-lifting activity')
-            }
-        }
-        
-        return key_mappings.get(condition, {})
+        extractor = _KEY_EXTRACTORS.get(condition)
+        return extractor(responses) if extractor else {}
     
     def _create_stress_summary(self, key_responses: Dict[str, str]) -> str:
         """Create stress-specific summary"""
-        return f"""Through this CBT exploration, you examined a stressful experience involving **{key_responses['situation']}**. Your most distressing thought was: *"{key_responses['hot_thought']}"*, which contributed to feelings of **{key_responses['emotions']}** and led to behaviors such as **{key_responses['behaviors']}**.
-
-Physically, you experienced **{key_responses['physical']}**, demonstrating the mind-body connection in stress responses.
-
-By examining the evidence and challenging unhelpful thinking patterns, you developed a more balanced perspective: *"{key_responses['balanced_thought']}"*. You also identified a new, empowering belief: *"{key_responses['new_belief']}"* and committed to taking action through **{key_responses['helpful_action']}**.
-
-This reflection demonstrates that stress involves not just external events, but how we interpret and respond to them. You've gained valuable insights for managing future stressful situations more effectively."""
+        return _STRESS_SUMMARY_TEMPLATE.format_map(key_responses)
     
     def _create_anxiety_summary(self, key_responses: Dict[str, str]) -> str:
         """Create anxiety-specific summary"""
-        return f"""This session explored your anxiety around **{key_responses['situation']}**, with your core fear being **{key_responses['fear']}**. Your most distressing thought was: *"{key_responses['hot_thought']}"*, which triggered **{key_responses['emotions']}** and led to behaviors like **{key_responses['behaviors']}**.
-
-You experienced physical symptoms including **{key_responses['physical']}**, highlighting anxiety's impact on the body.
-
-Through evidence examination, you developed a more balanced perspective: *"{key_responses['balanced_thought']}"*. You're working toward the empowering belief that *"{key_responses['new_belief']}"* and have committed to taking a small step forward: **{key_responses['small_step']}**.
-
-This process reveals that anxiety often involves overestimating danger while underestimating your coping abilities. You have more resilience and capability than your anxious mind suggests."""
+        return _ANXIETY_SUMMARY_TEMPLATE.format_map(key_responses)
     
     def _create_low_mood_summary(self, key_responses: Dict[str, str]) -> str:
         """Create low mood-specific summary"""
-        return f"""Your low mood was triggered by **{key_responses['trigger']}**, leading to the painful thought: *"{key_responses['hot_thought']}"*. This contributed to feelings of **{key_responses['emotions']}** and behaviors such as **{key_responses['behaviors']}**.
-
-You also noticed physical symptoms like **{key_responses['physical']}**, showing how mood affects the entire body.
-
-Through compassionate self-examination, you developed a more balanced perspective: *"{key_responses['balanced_perspective']}"*. You're cultivating the healthier belief that *"{key_responses['new_belief']}"* and have planned to engage in **{key_responses['tomorrow_activity']}** to support your mood.
-
-This reflection shows that depression often involves a harsh inner critic. By challenging these thoughts and planning positive activities, you're taking meaningful steps toward self-compassion and recovery."""
+        return _LOW_MOOD_SUMMARY_TEMPLATE.format_map(key_responses)
     
     def _generate_reflection_section(self, responses: Dict[str, str]) -> str:
         """Generate reflection and insights section"""
         
-        reflection_content = """## Key Insights and Reflections
-
-Through this CBT journaling process, several important patterns and insights emerged:
-
-### Thought-Emotion-Behavior Connection
-This session highlighted the interconnected nature of thoughts, emotions, and behaviors. By identifying and examining automatic thoughts, you gained awareness of how cognitive patterns influence your emotional and behavioral responses.
-
-### Evidence-Based Thinking
-You practiced evaluating thoughts objectively, considering both supporting and contradicting evidence. This skill helps develop more balanced, realistic perspectives rather than accepting thoughts at face value.
-
-### Cognitive Restructuring
-You successfully challenged unhelpful thinking patterns and developed more adaptive, compassionate ways of viewing yourself and your situation.
-
-### Actionable Insights
-You identified concrete steps you can take to apply these insights in daily life, moving from reflection to practical implementation.
-
----
-
-"""
+        parts = [_REFLECTION_INTRO]
         
         if 'new_belief' in responses:
-            reflection_content += f"### New Empowering Belief\n*\"{responses['new_belief']}\"*\n\nThis new belief represents a significant shift toward self-compassion and realistic self-assessment.\n\n"
+            parts.append(f"### New Empowering Belief\n*\"{responses['new_belief']}\"*\n\nThis new belief represents a significant shift toward self-compassion and realistic self-assessment.\n\n")
         
-        if any(key in responses for key in ['helpful_action', 'small_step', 'tomorrow_activity']):
-            action_key = next((key for key in ['helpful_action', 'small_step', 'tomorrow_activity'] if key in responses), None)
-            if action_key:
-                reflection_content += f"### Committed Action\n**{responses[action_key]}**\n\nThis commitment represents your intention to translate insights into meaningful behavioral change.\n\n"
+        for action_key in ACTION_KEYS:
+            if action_key in responses:
+                parts.append(f"### Committed Action\n**{responses[action_key]}**\n\nThis commitment represents your intention to translate insights into meaningful behavioral change.\n\n")
+                break
         
-        reflection_content += "---\n\n"
+        parts.append("---\n\n")
         
-        return reflection_content
-    
-    def _generate_footer(self, personality: str) -> str:
-        """Generate journal footer with encouragement"""
-        
-        footer_messages = {
-            'neutral': "Remember that CBT is a process of ongoing practice. The insights gained today provide a foundation for continued growth and self-understanding.",
-            
-            'conscientiousness': "Your systematic approach to this CBT process demonstrates excellent commitment to personal development. Consistent application of these evidence-based techniques will yield significant long-term benefits for your mental health and wellbeing.",
-            
-            'extraversion': "What an amazing journey of self-discovery you've completed today! Your openness and courage in exploring these thoughts and feelings is truly inspiring. Remember, every small step counts, and you're building something really meaningful for your mental health! 🌟"
-        }
-        
-        footer = f"""## Final Reflection
-
-{footer_messages.get(personality, footer_messages['neutral'])}
-
-### Next Steps
-1. **Review** this journal entry regularly to reinforce insights
-2. **Practice** the balanced thoughts and coping strategies identified
-3. **Implement** the action steps you've committed to
-4. **Monitor** your progress and celebrate small wins
-5. **Return** to these techniques when facing similar challenges
-
-### Session Completion
-**Date:** {datetime.now().strftime('%B %d, %Y')}
-**Duration:** CBT Therapeutic Writing Session
-**Focus:** Cognitive restructuring and insight development
-
----
-
-*This journal entry was generated from your CBT session responses and serves as a personal reference for ongoing mental health support. Keep this record for future reflection and progress tracking.*"""
-
-        return footer
+        return ''.join(parts)
     
     def export_journal_data(self, condition: str, personality: str, 
                           responses: Dict[str, str]) -> Dict[str, Any]:
         """Export journal data in structured format for research analysis"""
         
+        # Length and word totals from a single pass over the responses, lowercasing
+        # each once for the insight and theme scans
+        total_length = total_words = 0
+        lowered = []
+        for response in responses.values():
+            lowered.append(response.lower())
+            total_length += len(response)
+            total_words += _word_count(response)
+        
         return {
             'metadata': {
                 'condition': condition,
@@ -312,44 +440,30 @@ You identified concrete steps you can take to apply these insights in daily life
             },
             'responses': responses,
             'analysis': {
-                'avg_response_length': sum(len(response) for response in responses.values()) / len(responses) if responses else 0,
-                'total_word_count': sum(len(response.split()) for response in responses.values()),
-                'key_insights_identified': self._extract_insights_count(responses),
-                'therapeutic_themes': self._identify_therapeutic_themes(responses)
+                'avg_response_length': total_length / len(responses) if responses else 0,
+                'total_word_count': total_words,
+                'key_insights_identified': self._extract_insights_count(lowered),
+                'therapeutic_themes': self._identify_therapeutic_themes(' '.join(lowered))
             }
         }
     
     def _calculate_completion_percentage(self, condition: str, responses: Dict[str, str]) -> float:
         """Calculate session completion percentage"""
-        expected_counts = {'stress': 28, 'anxiety': 30, 'lowMood': 29}
-        expected = expected_counts.get(condition, 0)
+        expected = EXPECTED_RESPONSE_COUNTS.get(condition, 0)
         actual = len(responses)
         return (actual / expected * 100) if expected > 0 else 0
     
-    def _extract_insights_count(self, responses: Dict[str, str]) -> int:
-        """Count insight indicators in responses"""
-        insight_keywords = ['realize', 'understand', 'insight', 'pattern', 'connection', 'because']
-        count = 0
-        for response in responses.values():
-            count += sum(1 for keyword in insight_keywords if keyword.lower() in response.lower())
-        return count
+    def _extract_insights_count(self, responses_lower: Iterable[str]) -> int:
+        """Count insight indicators in already lowercased responses"""
+        return sum(map(_count_insights, responses_lower))
     
-    def _identify_therapeutic_themes(self, responses: Dict[str, str]) -> List[str]:
-        """Identify therapeutic themes present in responses"""
-        themes = []
-        all_text = ' '.join(responses.values()).lower()
-        
-        theme_keywords = {
-            'self_compassion': ['kind to myself', 'self-care', 'forgive myself', 'compassion'],
-            'cognitive_restructuring': ['balanced thought', 'realistic', 'evidence', 'challenge'],
-            'behavioral_activation': ['activity', 'action', 'do something', 'engage'],
-            'mindfulness': ['present', 'aware', 'notice', 'mindful'],
-            'coping_strategies': ['cope', 'manage', 'strategy', 'technique'],
-            'support_seeking': ['support', 'help', 'friend', 'family']
-        }
-        
-        for theme, keywords in theme_keywords.items():
-            if any(keyword in all_text for keyword in keywords):
-                themes.append(theme)
+    def _identify_therapeutic_themes(self, all_text_lower: str) -> List[str]:
+        """Identify therapeutic themes present in the joined, lowercased responses"""
+        found = set()
+        for match in _THEME_RE.finditer(all_text_lower):
+            found.add(match.lastgroup)
+            if len(found) == len(THEME_KEYWORDS):
+                break
         
-        return themes
\ No newline at end of file
+        # Reported in THEME_KEYWORDS order
+        return [theme for theme in THEME_KEYWORDS if theme in found]
\ No newline at end of file
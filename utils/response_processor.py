@@ -4,63 +4,276 @@ Response processing utilities for CBT Chatbot Research System
 
 import re
 import json
-from typing import Dict, List, Any, Tuple, Optional
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, List, Any, FrozenSet, Tuple, Optional
 from datetime import datetime
 import streamlit as st
 
+# Distinct (response, category) analyses remembered by each processor
+ANALYSIS_CACHE_SIZE = 512
+
+# Indicators of therapeutic engagement and insight, shared read-only by every processor
+THERAPEUTIC_INDICATORS = MappingProxyType({
+    'self_awareness': (
+        'i realize', 'i notice', 'i understand', 'i recognize', 'i see',
+        'pattern', 'connection', 'relationship', 'impact', 'effect',
+        'trigger', 'cause', 'lead to', 'result in'
+    ),
+    'emotional_processing': (
+        'feel', 'felt', 'emotion', 'emotional', 'mood', 'feelings',
+        'anxious', 'sad', 'angry', 'frustrated', 'overwhelmed',
+        'hopeful', 'calm', 'peaceful', 'content', 'relieved'
+    ),
+    'cognitive_restructuring': (
+        'thought', 'think', 'believe', 'assumption', 'expectation',
+        'realistic', 'balanced', 'alternative', 'different way',
+        'perspective', 'viewpoint', 'evidence', 'proof'
+    ),
+    'behavioral_insight': (
+        'behavior', 'action', 'reaction', 'response', 'habit',
+        'avoid', 'escape', 'withdraw', 'engage', 'participate',
+        'cope', 'manage', 'handle', 'deal with'
+    ),
+    'future_orientation': (
+        'will', 'plan', 'goal', 'hope', 'expect', 'next time',
+        'future', 'tomorrow', 'later', 'going to', 'intend'
+    ),
+    'self_compassion': (
+        'kind to myself', 'forgive myself', 'understanding',
+        'gentle', 'patient', 'compassionate', 'accepting',
+        'human', 'normal', 'understandable'
+    )
+})
+
+# Indicator phrase -> its category
+_INDICATOR_CATEGORIES = {
+    indicator: category
+    for category, indicators in THERAPEUTIC_INDICATORS.items()
+    for indicator in indicators
+}
+
+# Response validation rules
+VALIDATION_RULES = MappingProxyType({
+    'min_length': 10,
+    'max_length': 2000,
+    'min_words': 3,
+    'max_words': 500,
+    'required_engagement': True,
+    'block_inappropriate': True
+})
+
+# Patterns are compiled once at import rather than looked up per response;
+# the flagged phrases share one alternation so a response is scanned once
+_INAPPROPRIATE_RE = re.compile('|'.join((
+    r'\b(?:kill|die|death|suicide|harm)\s+myself\b',
+    r'\bsuicide\b',
+    r'\bharm\s+others\b',
+    r'\bviolent\b.*\bthoughts\b',
+    r'\bsubstance\s+abuse\b'
+)))
+
+_SENTENCE_END_RE = re.compile(r'[.!?]+')
+_WORD_RE = re.compile(r'\b\w+\b')
+
+# Kinds of concrete detail as named groups of one alternation. Every group
+# matches whole words only, so no match can hide another kind's match
+_CONCRETE_RE = re.compile('|'.join((
+    r'(?P<number>\b\d+\b)',
+    r'(?P<day>\b(?:yesterday|today|tomorrow|monday|tuesday|wednesday|thursday|friday|saturday|sunday)\b)',
+    r'(?P<time_of_day>\b(?:morning|afternoon|evening|night)\b)',
+    r'(?P<place>\b(?:home|work|school|office|gym|store)\b)'
+)))
+
+# Causal links that need a regex; the literal ones are CAUSAL_PHRASES
+_CAUSAL_RES = tuple(re.compile(pattern) for pattern in (
+    r'if.*then', r'when.*i', r'because.*i'
+))
+
+# Progress indicators as named groups of one lookahead, so the transcript is
+# scanned once. No two groups match at the same position and each group skips
+# hits inside its own previous match, so the counts equal a separate findall
+# per indicator even where different groups overlap ('cope' + 'emotion')
+_PROGRESS_RE = re.compile('(?=' + '|'.join((
+    r'(?P<self_awareness_growth>i (?:realize|understand|see|notice))',
+    r'(?P<emotional_processing>feel|felt|emotion)',
+    r'(?P<behavioral_insights>behavior|action|react|response)',
+    r'(?P<future_planning>will|plan|going to|next time)',
+    r'(?P<coping_strategies>cope|manage|handle|strategy)'
+)) + ')')
+
+# Words that on their own do not engage with a question; they are matched
+# against whitespace-split words, so the multi-word entries never match
+MINIMAL_RESPONSES = frozenset((
+    'yes', 'no', 'maybe', 'idk', "i don't know", 'nothing',
+    'not sure', 'dunno', 'nope', 'yep', 'fine', 'ok', 'okay'
+))
+
+# Phrases whose presence anywhere in a response is scored
+EMOTION_WORDS = frozenset((
+    'feel', 'felt', 'emotion', 'emotional', 'mood', 'feelings',
+    'anxious', 'nervous', 'worried', 'scared', 'afraid',
+    'sad', 'depressed', 'hopeless', 'empty', 'numb',
+    'angry', 'frustrated', 'irritated', 'annoyed',
+    'happy', 'joyful', 'content', 'peaceful', 'calm',
+    'excited', 'enthusiastic', 'motivated', 'hopeful',
+    'overwhelmed', 'stressed', 'tense', 'relaxed'
+))
+
+PERSONAL_EMOTION_PHRASES = frozenset((
+    'i feel', 'i felt', 'i am', "i'm", 'i was',
+    'made me feel', 'it feels', 'feeling'
+))
+
+SPECIFICITY_INDICATORS = frozenset((
+    'when', 'where', 'how', 'why', 'what', 'who',
+    'because', 'since', 'due to', 'as a result',
+    'for example', 'such as', 'like', 'including',
+    'specifically', 'particularly', 'especially'
+))
+
+INSIGHT_PHRASES = frozenset((
+    'i realize', 'i understand', 'i see', 'i notice',
+    'i recognize', 'i learned', 'i discovered',
+    'pattern', 'connection', 'relationship',
+    'this shows', 'this means', 'this suggests',
+    'because', 'since', 'as a result', 'therefore',
+    'leads to', 'causes', 'triggers', 'affects'
+))
+
+CAUSAL_PHRASES = frozenset((
+    'this makes me', 'which leads to', 'resulting in'
+))
+
+CATEGORY_KEYWORDS = MappingProxyType({
+    'Situation/Trigger': frozenset(('situation', 'event', 'happened', 'occurred', 'trigger', 'when')),
+    'Thoughts': frozenset(('thought', 'think', 'believe', 'mind', 'ideas', 'opinion')),
+    'Emotions': frozenset(('feel', 'emotion', 'mood', 'emotional', 'feelings')),
+    'Behaviors': frozenset(('did', 'action', 'behavior', 'react', 'response', 'avoid')),
+    'Physical Reactions': frozenset(('body', 'physical', 'symptoms', 'tension', 'heart', 'breathing')),
+    'Cognitive Distortions': frozenset(('thinking', 'pattern', 'assumption', 'belief')),
+    'Examine Evidence': frozenset(('evidence', 'proof', 'support', 'fact', 'true', 'reality')),
+    'Balanced Thought': frozenset(('balanced', 'realistic', 'alternative', 'different', 'helpful')),
+    'Action Planning': frozenset(('plan', 'action', 'step', 'do', 'will', 'going to'))
+})
+
+# Style markers looked for in the whole transcript, per chatbot personality
+SOCIAL_WORDS = ('people', 'friends', 'together', 'share', 'talk')
+ENTHUSIASM_MARKERS = ('excited', 'great', 'amazing', 'love', 'awesome')
+STRUCTURE_WORDS = ('plan', 'organize', 'systematic', 'goal', 'achieve')
+DETAIL_INDICATORS = ('specifically', 'detailed', 'thorough', 'comprehensive')
+
+# Every scored phrase list, indexed by its bit in _PHRASE_MASKS
+_SCORED_SETS = (EMOTION_WORDS, PERSONAL_EMOTION_PHRASES, SPECIFICITY_INDICATORS, INSIGHT_PHRASES,
+                CAUSAL_PHRASES, *CATEGORY_KEYWORDS.values())
+_EMOTION_SET, _PERSONAL_EMOTION_SET, _SPECIFICITY_SET, _INSIGHT_SET, _CAUSAL_SET = range(5)
+_CATEGORY_SETS = {category: index for index, category in enumerate(CATEGORY_KEYWORDS, 5)}
+
+# Phrase -> bitmask of the lists it belongs to, so phrases shared between lists
+# ('because', 'feel', 'action', ...) are looked up once and counted for each
+_PHRASE_MASKS: Dict[str, int] = {}
+for _index, _phrases in enumerate(_SCORED_SETS):
+    for _phrase in _phrases:
+        _PHRASE_MASKS[_phrase] = _PHRASE_MASKS.get(_phrase, 0) | 1 << _index
+del _index, _phrases, _phrase
+
+_SCORED_PHRASES = frozenset(_PHRASE_MASKS)
+
+# Every scored phrase in one lookahead alternation, longest first. Phrases that
+# start at the same position are prefixes of the longest one there, so each hit
+# also marks every scored phrase contained in it
+_SCORED_PHRASE_RE = re.compile('(?=(' + '|'.join(
+    re.escape(phrase) for phrase in sorted(_SCORED_PHRASES, key=len, reverse=True)
+) + '))')
+_CONTAINED_PHRASES = {
+    phrase: frozenset(other for other in _SCORED_PHRASES if other in phrase)
+    for phrase in _SCORED_PHRASES
+}
+
+
+def _count_sentences(text: str) -> int:
+    """Count runs of sentence terminators, so '...' or '?!' ends one sentence"""
+    terminators = text.count('.') + text.count('!') + text.count('?')
+    # Fewer than two terminators cannot form a longer run, so the count is exact
+    if terminators < 2:
+        return terminators
+    return len(_SENTENCE_END_RE.findall(text))
+
+
+def _count_whole_phrase(text: str, phrase: str) -> int:
+    """Count occurrences of phrase with no word character either side, like \\bphrase\\b"""
+    count = 0
+    text_length = len(text)
+    phrase_length = len(phrase)
+    position = text.find(phrase)
+    while position != -1:
+        end = position + phrase_length
+        if ((position == 0 or not _is_word_char(text[position - 1]))
+                and (end == text_length or not _is_word_char(text[end]))):
+            count += 1
+            position = text.find(phrase, end)
+        else:
+            position = text.find(phrase, position + 1)
+    return count
+
+
+def _is_word_char(char: str) -> bool:
+    """Whether char is matched by \\w"""
+    return char.isalnum() or char == '_'
+
+
+def _present_phrases(response_lower: str) -> FrozenSet[str]:
+    """Scored phrases occurring anywhere in one lowercased response"""
+    present = set()
+    for match in _SCORED_PHRASE_RE.finditer(response_lower):
+        present |= _CONTAINED_PHRASES[match.group(1)]
+    return frozenset(present)
+
+
+@lru_cache(maxsize=1024)
+def _phrase_counts(response_lower: str) -> Tuple[int, ...]:
+    """Number of present phrases from each scored list, indexed like _SCORED_SETS"""
+    counts = [0] * len(_SCORED_SETS)
+    for phrase in _present_phrases(response_lower):
+        mask = _PHRASE_MASKS[phrase]
+        while mask:
+            lowest = mask & -mask
+            counts[lowest.bit_length() - 1] += 1
+            mask ^= lowest
+    return tuple(counts)
+
+
+_VOWELS = frozenset('aeiouy')
+
+
+@lru_cache(maxsize=4096)
+def _word_syllables(word: str) -> int:
+    """Estimate syllables in one lowercased word"""
+    count = 0
+    prev_was_vowel = False
+    
+    # A syllable starts wherever a vowel follows a non-vowel; comparing the
+    # flags counts that transition without a branch per character
+    for is_vowel in map(_VOWELS.__contains__, word):
+        count += is_vowel > prev_was_vowel
+        prev_was_vowel = is_vowel
+    
+    if word.endswith('e') and count > 1:
+        count -= 1
+    
+    return max(1, count)
+
 
 class ResponseProcessor:
     """Processes and analyzes user responses for therapeutic content"""
     
     def __init__(self):
-        self.therapeutic_indicators = self._load_therapeutic_indicators()
-        self.validation_rules = self._load_validation_rules()
-        
-    def _load_therapeutic_indicators(self) -> Dict[str, List[str]]:
-        """Load indicators of therapeutic engagement and insight"""
-        return {
-            'self_awareness': [
-                'i realize', 'i notice', 'i understand', 'i recognize', 'i see',
-                'pattern', 'connection', 'relationship', 'impact', 'effect',
-                'trigger', 'cause', 'lead to', 'result in'
-            ],
-            'emotional_processing': [
-                'feel', 'felt', 'emotion', 'emotional', 'mood', 'feelings',
-                'anxious', 'sad', 'angry', 'frustrated', 'overwhelmed',
-                'hopeful', 'calm', 'peaceful', 'content', 'relieved'
-            ],
-            'cognitive_restructuring': [
-                'thought', 'think', 'believe', 'assumption', 'expectation',
-                'realistic', 'balanced', 'alternative', 'different way',
-                'perspective', 'viewpoint', 'evidence', 'proof'
-            ],
-            'behavioral_insight': [
-                'behavior', 'action', 'reaction', 'response', 'habit',
-                'avoid', 'escape', 'withdraw', 'engage', 'participate',
-                'cope', 'manage', 'handle', 'deal with'
-            ],
-            'future_orientation': [
-                'will', 'plan', 'goal', 'hope', 'expect', 'next time',
-                'future', 'tomorrow', 'later', 'going to', 'intend'
-            ],
-            'self_compassion': [
-                'kind to myself', 'forgive myself', 'understanding',
-                'gentle', 'patient', 'compassionate', 'accepting',
-                'human', 'normal', 'understandable'
-            ]
-        }
-    
-    def _load_validation_rules(self) -> Dict[str, Any]:
-        """Load response validation rules"""
-        return {
-            'min_length': 10,
-            'max_length': 2000,
-            'min_words': 3,
-            'max_words': 500,
-            'required_engagement': True,
-            'block_inappropriate': True
-        }
-    
+        self.therapeutic_indicators = THERAPEUTIC_INDICATORS
+        self.validation_rules = VALIDATION_RULES
+        # Analysis is deterministic in (response, category), and Streamlit reruns
+        # re-analyze the same responses, so results are memoized per processor
+        self._cached_analysis = lru_cache(maxsize=ANALYSIS_CACHE_SIZE)(self._analyze_response_quality)
+        
     def validate_response(self, response: str) -> Tuple[bool, Optional[str]]:
         """Validate user response and return validation result with message"""
         
@@ -75,7 +288,10 @@ class ResponseProcessor:
         if len(response) > self.validation_rules['max_length']:
             return False, f"Response is too long. Please keep it under {self.validation_rules['max_length']} characters."
         
-        word_count = len(response.split())
+        # Lowercased and split once for the word limits and both content checks
+        response_lower = response.lower()
+        response_words = response_lower.split()
+        word_count = len(response_words)
         if word_count < self.validation_rules['min_words']:
             return False, f"Please provide at least {self.validation_rules['min_words']} words in your response."
         
@@ -83,236 +299,162 @@ class ResponseProcessor:
             return False, f"Response is too long. Please keep it under {self.validation_rules['max_words']} words."
         
         if self.validation_rules['block_inappropriate']:
-            is_appropriate, message = self._check_appropriate_content(response)
+            is_appropriate, message = self._check_appropriate_content(response_lower)
             if not is_appropriate:
                 return False, message
         
         if self.validation_rules['required_engagement']:
-            is_engaged, message = self._check_engagement_level(response)
+            is_engaged, message = self._check_engagement_level(response_words)
             if not is_engaged:
                 return False, message
         
         return True, None
     
-    def _check_appropriate_content(self, response: str) -> Tuple[bool, Optional[str]]:
+    def _check_appropriate_content(self, response_lower: str) -> Tuple[bool, Optional[str]]:
         """Check if response contains appropriate content for therapeutic context"""
         
-        inappropriate_patterns = [
-            r'\b(kill|die|death|suicide|harm)\s+myself\b',
-            r'\bsuicide\b',
-            r'\bharm\s+others\b',
-            r'\bviolent\b.*\bthoughts\b',
-            r'\bsubstance\s+abuse\b'
-        ]
-        
-        response_lower = response.lower()
-        
-        for pattern in inappropriate_patterns:
-            if re.search(pattern, response_lower):
-                return False, "Your response contains content that requires professional support. Please consider reaching out to a mental health professional or crisis helpline."
+        if _INAPPROPRIATE_RE.search(response_lower):
+            return False, "Your response contains content that requires professional support. Please consider reaching out to a mental health professional or crisis helpline."
         
         return True, None
     
-    def _check_engagement_level(self, response: str) -> Tuple[bool, Optional[str]]:
+    def _check_engagement_level(self, response_words: List[str]) -> Tuple[bool, Optional[str]]:
         """Check if response shows adequate engagement with the question"""
         
-        minimal_responses = [
-            'yes', 'no', 'maybe', 'idk', "i don't know", 'nothing',
-            'not sure', 'dunno', 'nope', 'yep', 'fine', 'ok', 'okay'
-        ]
-        
-        response_words = response.lower().split()
-        
-        if len(response_words) <= 2 and any(word in minimal_responses for word in response_words):
+        if len(response_words) <= 2 and not MINIMAL_RESPONSES.isdisjoint(response_words):
             return False, "Please provide a more detailed response to help us understand your experience better."
         
-        unique_words = set(response_words)
-        if len(response_words) > 5 and len(unique_words) / len(response_words) < 0.3:
-            return False, "Please provide a more varied response with different thoughts and details."
+        word_count = len(response_words)
+        if word_count > 5:
+            # Smallest number of distinct words giving a 0.3 ratio under the same float division
+            minimum_unique = int(word_count * 0.3)
+            while minimum_unique / word_count < 0.3:
+                minimum_unique += 1
+            
+            # Varied responses reach that count early, so stop as soon as they do
+            unique_words = set()
+            for word in response_words:
+                unique_words.add(word)
+                if len(unique_words) >= minimum_unique:
+                    break
+            else:
+                return False, "Please provide a more varied response with different thoughts and details."
         
         return True, None
     
     def analyze_response_quality(self, response: str, question_category: str) -> Dict[str, Any]:
         """Analyze response quality and therapeutic indicators"""
+        analysis = self._cached_analysis(response, question_category)
+        # Callers own the returned dicts, so the cached entry is never handed out
+        return {**analysis, 'therapeutic_indicators': dict(analysis['therapeutic_indicators'])}
+    
+    def _analyze_response_quality(self, response: str, question_category: str) -> Dict[str, Any]:
+        """Compute the analysis returned by analyze_response_quality"""
+        
+        # Every helper works from the same lowercased text and counts
+        response_lower = response.lower()
+        word_count = len(response.split())
+        sentence_count = _count_sentences(response)
         
         analysis = {
-            'word_count': len(response.split()),
+            'word_count': word_count,
             'character_count': len(response),
-            'sentence_count': len(re.split(r'[.!?]+', response)) - 1,
-            'therapeutic_indicators': self._count_therapeutic_indicators(response),
-            'emotional_depth': self._assess_emotional_depth(response),
-            'specificity_score': self._assess_specificity(response),
-            'insight_level': self._assess_insight_level(response),
-            'category_relevance': self._assess_category_relevance(response, question_category),
-            'readability_score': self._calculate_readability(response)
+            'sentence_count': sentence_count,
+            'therapeutic_indicators': self._count_therapeutic_indicators(response_lower),
+            'emotional_depth': self._assess_emotional_depth(response_lower, word_count),
+            'specificity_score': self._assess_specificity(response_lower, word_count),
+            'insight_level': self._assess_insight_level(response_lower, word_count),
+            'category_relevance': self._assess_category_relevance(response_lower, question_category),
+            'readability_score': self._calculate_readability(response_lower, word_count, sentence_count)
         }
         
         analysis['overall_quality_score'] = self._calculate_quality_score(analysis)
         
         return analysis
     
-    def _count_therapeutic_indicators(self, response: str) -> Dict[str, int]:
+    def _count_therapeutic_indicators(self, response_lower: str) -> Dict[str, int]:
         """Count therapeutic indicators in response"""
-        response_lower = response.lower()
-        indicator_counts = {}
+        indicator_counts = dict.fromkeys(self.therapeutic_indicators, 0)
         
-        for category, indicators in self.therapeutic_indicators.items():
-            count = 0
-            for indicator in indicators:
-                count += len(re.findall(r'\b' + re.escape(indicator) + r'\b', response_lower))
-            indicator_counts[category] = count
+        # A substring test rules out most indicators before any boundary checks
+        for indicator, category in _INDICATOR_CATEGORIES.items():
+            if indicator in response_lower:
+                indicator_counts[category] += _count_whole_phrase(response_lower, indicator)
         
         return indicator_counts
     
-    def _assess_emotional_depth(self, response: str) -> float:
+    def _assess_emotional_depth(self, response_lower: str, word_count: int) -> float:
         """Assess emotional depth and processing in response"""
         
-        emotion_words = [
-            'feel', 'felt', 'emotion', 'emotional', 'mood', 'feelings',
-            'anxious', 'nervous', 'worried', 'scared', 'afraid',
-            'sad', 'depressed', 'hopeless', 'empty', 'numb',
-            'angry', 'frustrated', 'irritated', 'annoyed',
-            'happy', 'joyful', 'content', 'peaceful', 'calm',
-            'excited', 'enthusiastic', 'motivated', 'hopeful',
-            'overwhelmed', 'stressed', 'tense', 'relaxed'
-        ]
-        
-        response_lower = response.lower()
-        emotion_count = sum(1 for word in emotion_words if word in response_lower)
+        counts = _phrase_counts(response_lower)
+        emotion_count = counts[_EMOTION_SET]
+        personal_count = counts[_PERSONAL_EMOTION_SET]
         
-        personal_emotion_patterns = [
-            r'i feel', r'i felt', r'i am', r"i'm", r'i was',
-            r'made me feel', r'it feels', r'feeling'
-        ]
-        
-        personal_count = sum(1 for pattern in personal_emotion_patterns 
-                           if re.search(pattern, response_lower))
-        
-        word_count = len(response.split())
         depth_score = min(100, ((emotion_count + personal_count * 2) / max(word_count / 10, 1)) * 100)
         
         return depth_score
     
-    def _assess_specificity(self, response: str) -> float:
+    def _assess_specificity(self, response_lower: str, word_count: int) -> float:
         """Assess specificity and detail in response"""
         
-        specificity_indicators = [
-            'when', 'where', 'how', 'why', 'what', 'who',
-            'because', 'since', 'due to', 'as a result',
-            'for example', 'such as', 'like', 'including',
-            'specifically', 'particularly', 'especially'
-        ]
-        
-        response_lower = response.lower()
-        specificity_count = sum(1 for indicator in specificity_indicators 
-                              if indicator in response_lower)
+        specificity_count = _phrase_counts(response_lower)[_SPECIFICITY_SET]
         
-        concrete_patterns = [
-            r'\b\d+\b',
-            r'\b(yesterday|today|tomorrow|monday|tuesday|wednesday|thursday|friday|saturday|sunday)\b',
-            r'\b(morning|afternoon|evening|night)\b',
-            r'\b(home|work|school|office|gym|store)\b'
-        ]
+        concrete_kinds = set()
+        for match in _CONCRETE_RE.finditer(response_lower):
+            concrete_kinds.add(match.lastgroup)
+            if len(concrete_kinds) == len(_CONCRETE_RE.groupindex):
+                break
+        concrete_count = len(concrete_kinds)
         
-        concrete_count = sum(1 for pattern in concrete_patterns 
-                           if re.search(pattern, response_lower))
-        
-        word_count = len(response.split())
         specificity_score = min(100, ((specificity_count + concrete_count) / max(word_count / 15, 1)) * 100)
         
         return specificity_score
     
-    def _assess_insight_level(self, response: str) -> float:
+    def _assess_insight_level(self, response_lower: str, word_count: int) -> float:
         """Assess level of insight and self-awareness in response"""
         
-        insight_patterns = [
-            r'i realize', r'i understand', r'i see', r'i notice',
-            r'i recognize', r'i learned', r'i discovered',
-            r'pattern', r'connection', r'relationship',
-            r'this shows', r'this means', r'this suggests',
-            r'because', r'since', r'as a result', r'therefore',
-            r'leads to', r'causes', r'triggers', r'affects'
-        ]
-        
-        response_lower = response.lower()
-        insight_count = sum(1 for pattern in insight_patterns 
-                          if re.search(pattern, response_lower))
-        
-        causal_patterns = [
-            r'if.*then', r'when.*i', r'because.*i',
-            r'this makes me', r'which leads to', r'resulting in'
-        ]
+        counts = _phrase_counts(response_lower)
+        insight_count = counts[_INSIGHT_SET]
         
-        causal_count = sum(1 for pattern in causal_patterns 
-                         if re.search(pattern, response_lower))
+        causal_count = counts[_CAUSAL_SET] + sum(1 for pattern in _CAUSAL_RES 
+                                                 if pattern.search(response_lower))
         
-        word_count = len(response.split())
         insight_score = min(100, ((insight_count + causal_count * 2) / max(word_count / 20, 1)) * 100)
         
         return insight_score
     
-    def _assess_category_relevance(self, response: str, category: str) -> float:
+    def _assess_category_relevance(self, response_lower: str, category: str) -> float:
         """Assess how well response addresses the question category"""
         
-        category_keywords = {
-            'Situation/Trigger': ['situation', 'event', 'happened', 'occurred', 'trigger', 'when'],
-            'Thoughts': ['thought', 'think', 'believe', 'mind', 'ideas', 'opinion'],
-            'Emotions': ['feel', 'emotion', 'mood', 'emotional', 'feelings'],
-            'Behaviors': ['did', 'action', 'behavior', 'react', 'response', 'avoid'],
-            'Physical Reactions': ['body', 'physical', 'symptoms', 'tension', 'heart', 'breathing'],
-            'Cognitive Distortions': ['thinking', 'pattern', 'assumption', 'belief'],
-            'Examine Evidence': ['evidence', 'proof', 'support', 'fact', 'true', 'reality'],
-            'Balanced Thought': ['balanced', 'realistic', 'alternative', 'different', 'helpful'],
-            'Action Planning': ['plan', 'action', 'step', 'do', 'will', 'going to']
-        }
-        
-        keywords = category_keywords.get(category, [])
-        if not keywords:
+        index = _CATEGORY_SETS.get(category)
+        if index is None:
             return 50.0
         
-        response_lower = response.lower()
-        relevance_count = sum(1 for keyword in keywords if keyword in response_lower)
+        # Every category is counted by the one phrase scan, so asking about
+        # another category for the same response is a lookup
+        relevance_count = _phrase_counts(response_lower)[index]
         
-        relevance_score = min(100, (relevance_count / len(keywords)) * 100)
+        relevance_score = min(100, (relevance_count / len(_SCORED_SETS[index])) * 100)
         
         return relevance_score
     
-    def _calculate_readability(self, response: str) -> float:
+    def _calculate_readability(self, response_lower: str, words: int, sentences: int) -> float:
         """Calculate readability score"""
         
-        sentences = len(re.split(r'[.!?]+', response)) - 1
-        words = len(response.split())
-        syllables = self._count_syllables(response)
-        
+        # Unscorable responses return before paying for the syllable count
         if sentences == 0 or words == 0:
             return 0.0
         
+        syllables = self._count_syllables(response_lower)
+        
         score = 206.835 - (1.015 * (words / sentences)) - (84.6 * (syllables / words))
         
         return max(0, min(100, score))
     
-    def _count_syllables(self, text: str) -> int:
-        """Estimate syllable count in text"""
-        words = re.findall(r'\b\w+\b', text.lower())
-        syllable_count = 0
-        
-        for word in words:
-            vowels = 'aeiouy'
-            count = 0
-            prev_was_vowel = False
-            
-            for char in word:
-                is_vowel = char in vowels
-                if is_vowel and not prev_was_vowel:
-                    count += 1
-                prev_was_vowel = is_vowel
-            
-            if word.endswith('e') and count > 1:
-                count -= 1
-            
-            syllable_count += max(1, count)
-        
-        return syllable_count
+    def _count_syllables(self, text_lower: str) -> int:
+        """Estimate syllable count in lowercased text"""
+        # Words recur heavily across responses, so the per-word count is cached
+        return sum(map(_word_syllables, _WORD_RE.findall(text_lower)))
     
     def _calculate_quality_score(self, analysis: Dict[str, Any]) -> float:
         """Calculate overall response quality score"""
@@ -389,6 +531,7 @@ class ResponseProcessor:
         total_quality = 0
         total_depth = 0
         total_insight = 0
+        total_words = 0
         
         for response_id, response_text in responses.items():
             analysis = self.analyze_response_quality(response_text, 'General')
@@ -397,6 +540,7 @@ class ResponseProcessor:
             total_quality += analysis['overall_quality_score']
             total_depth += analysis['emotional_depth']
             total_insight += analysis['insight_level']
+            total_words += analysis['word_count']
         
         response_count = len(responses)
         if response_count > 0:
@@ -404,34 +548,36 @@ class ResponseProcessor:
                 'avg_quality_score': total_quality / response_count,
                 'avg_emotional_depth': total_depth / response_count,
                 'avg_insight_level': total_insight / response_count,
-                'total_word_count': sum(len(r.split()) for r in responses.values()),
-                'avg_response_length': sum(len(r.split()) for r in responses.values()) / response_count
+                'total_word_count': total_words,
+                'avg_response_length': total_words / response_count
             }
         
-        analytics['therapeutic_analysis'] = self._analyze_therapeutic_progress(responses)
+        # Both session-level analyses read the same lowercased transcript
+        all_text = ' '.join(responses.values()).lower()
+        
+        analytics['therapeutic_analysis'] = self._analyze_therapeutic_progress(all_text)
         
         analytics['personality_insights'] = self._analyze_personality_influence(
-            responses, personality, analytics['aggregate_metrics']
+            all_text, personality, analytics['aggregate_metrics']
         )
         
         return analytics
     
-    def _analyze_therapeutic_progress(self, responses: Dict[str, str]) -> Dict[str, Any]:
-        """Analyze therapeutic progress indicators across responses"""
+    def _analyze_therapeutic_progress(self, all_text: str) -> Dict[str, Any]:
+        """Analyze therapeutic progress indicators across the lowercased responses"""
         
-        all_text = ' '.join(responses.values()).lower()
+        progress_indicators = dict.fromkeys(_PROGRESS_RE.groupindex, 0)
+        match_ends = dict.fromkeys(_PROGRESS_RE.groupindex, 0)
         
-        progress_indicators = {
-            'self_awareness_growth': len(re.findall(r'i (realize|understand|see|notice)', all_text)),
-            'emotional_processing': len(re.findall(r'(feel|felt|emotion)', all_text)),
-            'behavioral_insights': len(re.findall(r'(behavior|action|react|response)', all_text)),
-            'future_planning': len(re.findall(r'(will|plan|going to|next time)', all_text)),
-            'coping_strategies': len(re.findall(r'(cope|manage|handle|strategy)', all_text))
-        }
+        for match in _PROGRESS_RE.finditer(all_text):
+            name = match.lastgroup
+            if match.start() >= match_ends[name]:
+                progress_indicators[name] += 1
+                match_ends[name] = match.end(name)
         
         return progress_indicators
     
-    def _analyze_personality_influence(self, responses: Dict[str, str], 
+    def _analyze_personality_influence(self, all_text: str, 
                                      personality: str, metrics: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze how personality might have influenced responses"""
         
@@ -442,24 +588,16 @@ class ResponseProcessor:
         }
         
         if personality == 'extraversion':
-            all_text = ' '.join(responses.values()).lower()
-            social_words = ['people', 'friends', 'together', 'share', 'talk']
-            enthusiasm_markers = ['excited', 'great', 'amazing', 'love', 'awesome']
-            
             personality_analysis['response_style_indicators'] = {
-                'social_references': sum(1 for word in social_words if word in all_text),
-                'enthusiasm_markers': sum(1 for word in enthusiasm_markers if word in all_text),
+                'social_references': sum(map(all_text.__contains__, SOCIAL_WORDS)),
+                'enthusiasm_markers': sum(map(all_text.__contains__, ENTHUSIASM_MARKERS)),
                 'avg_response_length': metrics.get('avg_response_length', 0)
             }
         
         elif personality == 'conscientiousness':
-            all_text = ' '.join(responses.values()).lower()
-            structure_words = ['plan', 'organize', 'systematic', 'goal', 'achieve']
-            detail_indicators = ['specifically', 'detailed', 'thorough', 'comprehensive']
-            
             personality_analysis['response_style_indicators'] = {
-                'structure_references': sum(1 for word in structure_words if word in all_text),
-                'detail_indicators': sum(1 for word in detail_indicators if word in all_text),
+                'structure_references': sum(map(all_text.__contains__, STRUCTURE_WORDS)),
+                'detail_indicators': sum(map(all_text.__contains__, DETAIL_INDICATORS)),
                 'formal_language_score': metrics.get('avg_quality_score', 0)
             }
         